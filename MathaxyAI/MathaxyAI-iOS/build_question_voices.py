@@ -0,0 +1,275 @@
+#!/usr/bin/env python3
+# Mathaxy iOS 题目语音拼接生成脚本
+# 每种语言只用 gTTS / 豆包合成一次可复用的语音单元（数字 0-18、"加"、"等于"、提问语），
+# 再离线把单元按题目拼接（交叉淡化 + 向量化混音），生成全部 "3 加 8 等于几？" 题目语音
+#
+# 用法：
+#     python3 build_question_voices.py                    # gTTS 合成单元，生成 100 道题 × 7 种语言
+#     python3 build_question_voices.py --backend doubao   # 使用豆包 API 合成单元
+#     python3 build_question_voices.py --answers          # 同时生成 "3 加 8 等于 11" 答案语音
+
+import os
+import sys
+import json
+import argparse
+import subprocess
+from concurrent.futures import ThreadPoolExecutor
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from process_voice_files import (SCRIPT_DIR, SOUNDS_DIR, TARGET_SAMPLE_RATE, PAD_SECONDS,
+                                 ASSEMBLED_QUESTION_PREFIX, ASSEMBLED_ANSWER_PREFIX, decode, encode,
+                                 trim_silence, normalize, apply_fades)
+
+# 语音单元缓存（不放在 Sounds 目录，避免被打包进应用）
+UNITS_DIR = os.path.join(SCRIPT_DIR, ".voice_units")
+UNITS_MANIFEST_PATH = os.path.join(UNITS_DIR, "manifest.json")
+
+# 加数范围（与 QuestionGenerator.swift 一致：0...9）
+ADDENDS = range(10)
+NUMBERS = range(max(ADDENDS) * 2 + 1)  # 0-18
+
+# 语音单元文本（数字直接交给 TTS 朗读）
+UNIT_TEXT = {
+    "plus": {
+        "zh-Hans": "加",
+        "zh-Hant": "加",
+        "en": "plus",
+        "ja": "たす",
+        "ko": "더하기",
+        "es": "más",
+        "pt": "mais"
+    },
+    "equals": {
+        "zh-Hans": "等于",
+        "zh-Hant": "等於",
+        "en": "equals",
+        "ja": "は",
+        "ko": "하면",
+        "es": "son",
+        "pt": "são"
+    },
+    "ask": {
+        "zh-Hans": "等于几？",
+        "zh-Hant": "等於幾？",
+        "en": "What is",
+        "ja": "はいくつ？",
+        "ko": "얼마일까요?",
+        "es": "¿Cuánto es",
+        "pt": "Quanto é"
+    }
+}
+
+# 题目与答案的单元顺序（a、b 为加数，sum 为和）
+QUESTION_TEMPLATES = {
+    "zh-Hans": ["a", "plus", "b", "ask"],
+    "zh-Hant": ["a", "plus", "b", "ask"],
+    "en": ["ask", "a", "plus", "b"],
+    "ja": ["a", "plus", "b", "ask"],
+    "ko": ["a", "plus", "b", "ask"],
+    "es": ["ask", "a", "plus", "b"],
+    "pt": ["ask", "a", "plus", "b"]
+}
+ANSWER_TEMPLATE = ["a", "plus", "b", "equals", "sum"]
+
+# 拼接参数
+# 相邻单元的交叉淡化长度：与 trim_silence 保留的首尾余量一致，重叠部分基本是余量里的弱音，
+# 两段余量合起来正好形成词间的自然停顿
+CROSSFADE_SECONDS = PAD_SECONDS
+
+def unit_keys():
+    """每种语言需要合成的单元"""
+    return [str(n) for n in NUMBERS] + list(UNIT_TEXT)
+
+def unit_text(key, language):
+    """单元的朗读文本"""
+    return UNIT_TEXT[key][language] if key in UNIT_TEXT else key
+
+def unit_path(key, language):
+    """单元缓存文件路径"""
+    return os.path.join(UNITS_DIR, language, f"{key}.mp3")
+
+def load_backend(name):
+    """返回 (generate_voice_file, 语言代码映射)，复用现有生成脚本"""
+    if name == "doubao":
+        import generate_voice_files_doubao as backend
+        if backend.DOUBAO_API_KEY == "your_api_key_here":
+            raise ValueError("请在 generate_voice_files_doubao.py 中设置 DOUBAO_API_KEY")
+    else:
+        import generate_voice_files as backend
+    return backend.generate_voice_file, backend.LANGUAGES
+
+def synthesize_units(backend_name, languages, force=False):
+    """合成缺失或文本已变化的单元，返回 (API 调用次数, 失败次数)"""
+    generate_voice_file, backend_languages = load_backend(backend_name)
+    manifest = {}
+    if os.path.exists(UNITS_MANIFEST_PATH) and not force:
+        with open(UNITS_MANIFEST_PATH, 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+
+    jobs = []
+    for language in languages:
+        os.makedirs(os.path.join(UNITS_DIR, language), exist_ok=True)
+        for key in unit_keys():
+            text = unit_text(key, language)
+            entry = {"text": text, "backend": backend_name}
+            if manifest.get(f"{language}/{key}") != entry or not os.path.exists(unit_path(key, language)):
+                jobs.append((language, key, entry))
+
+    # TTS 请求以网络等待为主，线程池并行
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        results = list(executor.map(
+            lambda job: generate_voice_file(job[2]["text"], backend_languages[job[0]], unit_path(job[1], job[0])), jobs))
+
+    fail_count = 0
+    for (language, key, entry), ok in zip(jobs, results):
+        if ok:
+            manifest[f"{language}/{key}"] = entry
+        else:
+            fail_count += 1
+    with open(UNITS_MANIFEST_PATH, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2, sort_keys=True)
+    return len(jobs), fail_count
+
+def load_units(language):
+    """解码并裁剪一种语言的所有单元，首尾加等功率淡入淡出，返回 {单元: float32 采样}"""
+    fade = int(CROSSFADE_SECONDS * TARGET_SAMPLE_RATE)
+    ramp = np.sin(np.linspace(0.0, np.pi / 2, fade, dtype=np.float32))
+    units = {}
+    for key in unit_keys():
+        samples, _, _ = trim_silence(decode(unit_path(key, language)))
+        samples = normalize(samples).astype(np.float32)
+        if len(samples) >= 2 * fade:
+            samples[:fade] *= ramp
+            samples[-fade:] *= ramp[::-1]
+        units[key] = samples
+    return units
+
+def prompt_units(template, a, b):
+    """按模板展开一条语音的单元序列"""
+    values = {"a": str(a), "b": str(b), "sum": str(a + b)}
+    return [values.get(part, part) for part in template]
+
+def assemble(units, sequences):
+    """批量拼接：所有语音排在同一个缓冲区中，每个单元一次向量化叠加到它出现的所有位置
+
+    相邻单元重叠 CROSSFADE_SECONDS（单元已加等功率淡入淡出，重叠相加即交叉淡化）。
+    返回与 sequences 对应的采样数组列表。
+    """
+    overlap = int(CROSSFADE_SECONDS * TARGET_SAMPLE_RATE)
+    placements = {key: [] for key in units}
+    bounds = []
+    position = 0
+    for sequence in sequences:
+        start = position
+        for i, key in enumerate(sequence):
+            if i > 0:
+                position -= min(overlap, len(units[key]))
+            placements[key].append(position)
+            position += len(units[key])
+        bounds.append((start, position))
+
+    buffer = np.zeros(position, dtype=np.float32)
+    for key, offsets in placements.items():
+        if offsets:
+            unit = units[key]
+            # 同一单元的各次出现之间至少隔着一个其他单元，索引不重叠，可直接用花式索引累加
+            buffer[np.asarray(offsets)[:, None] + np.arange(len(unit))] += unit
+    return [buffer[start:end] for start, end in bounds]
+
+def build_language(language, output_dir, answers=False):
+    """生成一种语言的题目（和答案）语音，返回 (成功数, 失败数)"""
+    units = load_units(language)
+    outputs = []
+    sequences = []
+    for a in ADDENDS:
+        for b in ADDENDS:
+            outputs.append(os.path.join(output_dir, f"{ASSEMBLED_QUESTION_PREFIX}{a}_plus_{b}_{language}.m4a"))
+            sequences.append(prompt_units(QUESTION_TEMPLATES[language], a, b))
+            if answers:
+                outputs.append(os.path.join(output_dir, f"{ASSEMBLED_ANSWER_PREFIX}{a}_plus_{b}_{language}.m4a"))
+                sequences.append(prompt_units(ANSWER_TEMPLATE, a, b))
+
+    prompts = assemble(units, sequences)
+
+    def write(job):
+        path, samples = job
+        try:
+            encode(apply_fades(normalize(samples)), path)
+            return True
+        except (subprocess.CalledProcessError, OSError) as e:
+            print(f"❌ 编码失败 {os.path.basename(path)}: {str(e)}")
+            return False
+
+    # ffmpeg 编码在子进程中进行，线程池并行
+    with ThreadPoolExecutor(max_workers=os.cpu_count()) as executor:
+        results = list(executor.map(write, zip(outputs, prompts)))
+    return sum(results), len(results) - sum(results)
+
+def main():
+    """主函数"""
+    parser = argparse.ArgumentParser(description="Mathaxy 题目语音拼接生成工具")
+    parser.add_argument('--backend', choices=['gtts', 'doubao'], default='gtts', help="语音单元的合成后端")
+    parser.add_argument('--answers', action='store_true', help="同时生成答案语音")
+    parser.add_argument('--languages', nargs='+', default=list(QUESTION_TEMPLATES), help="要生成的语言")
+    parser.add_argument('--output-dir', default=SOUNDS_DIR, help="输出目录")
+    parser.add_argument('--force', action='store_true', help="忽略单元缓存，重新合成所有单元")
+    args = parser.parse_args()
+
+    # 检查目录
+    if not os.path.exists(args.output_dir):
+        print(f"❌ 目录不存在: {args.output_dir}")
+        sys.exit(1)
+
+    print("🎵 Mathaxy 题目语音拼接生成工具")
+    print("=============================")
+    print()
+
+    # 检查依赖
+    if np is None:
+        print("⚠️  缺少依赖库 numpy")
+        print("请运行: pip3 install numpy")
+        sys.exit(1)
+
+    per_language = len(ADDENDS) ** 2 * (2 if args.answers else 1)
+    print(f"📁 输出目录: {args.output_dir}")
+    print(f"🌍 语言: {len(args.languages)} 种")
+    print(f"🧩 每种语言语音单元: {len(unit_keys())} 个")
+    print(f"📝 预计生成: {per_language * len(args.languages)} 个语音文件")
+    print()
+
+    try:
+        calls, fail_count = synthesize_units(args.backend, args.languages, args.force)
+    except ImportError as e:
+        print(f"⚠️  缺少依赖库: {e.name}")
+        print("请运行: pip3 install gtts requests")
+        sys.exit(1)
+    except ValueError as e:
+        print(f"⚠️  {str(e)}")
+        sys.exit(1)
+    print(f"🔊 TTS 请求: {calls} 次（其余单元使用缓存）")
+    if fail_count:
+        print(f"❌ {fail_count} 个单元合成失败，请重试")
+        sys.exit(1)
+    print()
+
+    success_count = 0
+    fail_count = 0
+    for language in args.languages:
+        print(f"🔄 拼接 {language} 语音...")
+        success, failed = build_language(language, args.output_dir, args.answers)
+        success_count += success
+        fail_count += failed
+
+    print()
+    print("=============================")
+    print("🎉 题目语音生成完成！")
+    print(f"✅ 成功: {success_count} 个")
+    print(f"❌ 失败: {fail_count} 个")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
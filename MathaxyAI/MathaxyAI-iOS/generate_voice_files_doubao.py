@@ -174,6 +174,8 @@ def main():
     if success_count > 0:
         print("📁 生成的文件已保存到:")
         print(f"   {os.path.abspath(SOUNDS_DIR)}")
+        print()
+        print("💡 下一步: 运行 python3 process_voice_files.py 裁剪静音并统一格式")
     
     return 0
 
@@ -0,0 +1,220 @@
+#!/usr/bin/env python3
+# Mathaxy iOS 语音文件后处理脚本
+# 对 gTTS / 豆包生成的语音批量执行：裁剪首尾静音、统一采样率、峰值归一化、重新编码
+
+import os
+import sys
+import json
+import shutil
+import hashlib
+import tempfile
+import subprocess
+import re
+from concurrent.futures import ThreadPoolExecutor
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# 脚本所在目录
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+# 音效目录
+SOUNDS_DIR = os.path.join(SCRIPT_DIR, "Mathaxy", "Resources", "Sounds")
+# 处理结果缓存（不放在 Sounds 目录，避免被打包进应用）
+CACHE_PATH = os.path.join(SCRIPT_DIR, ".voice_process_cache.json")
+
+# 语音语言代码（与 generate_voice_files.py 的 LANGUAGES 一致；
+# 该脚本在模块顶部导入 gtts，这里不直接导入）
+VOICE_LANGUAGES = ("zh-Hans", "zh-Hant", "en", "ja", "ko", "es", "pt")
+
+# build_question_voices.py 拼接生成的题目/答案语音（单元已处理过，不再重复裁剪和重新编码）
+ASSEMBLED_QUESTION_PREFIX = "q_voice_question_"
+ASSEMBLED_ANSWER_PREFIX = "q_voice_answer_"
+
+# 语音文件：generate_voice_files.py 生成的 {类型}_{语言}.mp3 和 Q 版 q_voice_*.m4a
+# 语言后缀必须是已知语言代码，避免误匹配 correct_answer.mp3 等音效
+# 拼接生成的题目/答案语音同样以 q_voice_ 开头，需要排除
+VOICE_PATTERN = re.compile(
+    r'^((?!%s)q_voice_.+|(correct|incorrect|encouragement|panda_greeting|rabbit_greeting)_(%s))\.(mp3|m4a)$'
+    % ('|'.join(re.escape(p) for p in (ASSEMBLED_QUESTION_PREFIX, ASSEMBLED_ANSWER_PREFIX)),
+       '|'.join(re.escape(language) for language in VOICE_LANGUAGES)))
+
+# 处理参数
+TARGET_SAMPLE_RATE = 44100
+SILENCE_THRESHOLD_DB = -45.0   # 低于该帧能量视为静音
+FRAME_SECONDS = 0.01           # 能量检测帧长
+PAD_SECONDS = 0.02             # 裁剪后保留的首尾余量
+FADE_SECONDS = 0.005           # 首尾淡入淡出，避免爆音
+TARGET_PEAK_DB = -1.0          # 峰值归一化目标
+ENCODERS = {
+    '.mp3': ['-c:a', 'libmp3lame', '-b:a', '128k'],
+    '.m4a': ['-c:a', 'aac', '-b:a', '96k'],
+}
+
+PARAMS_KEY = json.dumps([TARGET_SAMPLE_RATE, SILENCE_THRESHOLD_DB, FRAME_SECONDS, PAD_SECONDS,
+                         FADE_SECONDS, TARGET_PEAK_DB, ENCODERS], sort_keys=True)
+
+def find_voice_files(sounds_dir=SOUNDS_DIR):
+    """查找所有语音文件"""
+    return sorted(os.path.join(sounds_dir, f) for f in os.listdir(sounds_dir) if VOICE_PATTERN.match(f))
+
+def file_hash(path):
+    """计算文件 SHA-256"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def load_cache():
+    """读取处理结果缓存"""
+    if not os.path.exists(CACHE_PATH):
+        return {}
+    try:
+        with open(CACHE_PATH, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def save_cache(cache):
+    """保存处理结果缓存"""
+    with open(CACHE_PATH, 'w', encoding='utf-8') as f:
+        json.dump(cache, f, ensure_ascii=False, indent=2, sort_keys=True)
+
+def decode(path):
+    """用 ffmpeg 解码并重采样为单声道 float32"""
+    result = subprocess.run(
+        ['ffmpeg', '-loglevel', 'error', '-i', path,
+         '-f', 'f32le', '-ac', '1', '-ar', str(TARGET_SAMPLE_RATE), 'pipe:1'],
+        stdout=subprocess.PIPE, check=True,
+    )
+    return np.frombuffer(result.stdout, dtype='<f4').astype(np.float32)
+
+def encode(samples, path):
+    """重新编码并原子替换原文件"""
+    ext = os.path.splitext(path)[1].lower()
+    fd, tmp_path = tempfile.mkstemp(suffix=ext, dir=os.path.dirname(path))
+    os.close(fd)
+    try:
+        subprocess.run(
+            ['ffmpeg', '-y', '-loglevel', 'error',
+             '-f', 'f32le', '-ar', str(TARGET_SAMPLE_RATE), '-ac', '1', '-i', 'pipe:0']
+            + ENCODERS[ext] + [tmp_path],
+            input=samples.astype('<f4').tobytes(), check=True,
+        )
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+def trim_silence(samples, sample_rate=TARGET_SAMPLE_RATE):
+    """按帧能量裁剪首尾静音，返回 (裁剪后的采样, 首部裁掉的采样数, 尾部裁掉的采样数)"""
+    frame = int(FRAME_SECONDS * sample_rate)
+    count = len(samples) // frame
+    if count == 0:
+        return samples, 0, 0
+
+    frames = samples[:count * frame].reshape(count, frame)
+    energy_db = 10 * np.log10(np.mean(frames * frames, axis=1) + 1e-12)
+    voiced = np.flatnonzero(energy_db > SILENCE_THRESHOLD_DB)
+    if voiced.size == 0:
+        return samples, 0, 0
+
+    pad = int(PAD_SECONDS * sample_rate)
+    start = max(0, voiced[0] * frame - pad)
+    end = min(len(samples), (voiced[-1] + 1) * frame + pad)
+    return samples[start:end], start, len(samples) - end
+
+def normalize(samples):
+    """峰值归一化到 TARGET_PEAK_DB"""
+    peak = float(np.max(np.abs(samples))) if samples.size else 0.0
+    if peak == 0.0:
+        return samples
+    return samples * (10 ** (TARGET_PEAK_DB / 20) / peak)
+
+def apply_fades(samples, sample_rate=TARGET_SAMPLE_RATE):
+    """首尾短淡入淡出"""
+    length = min(int(FADE_SECONDS * sample_rate), len(samples) // 2)
+    if length == 0:
+        return samples
+    samples = samples.copy()
+    ramp = np.linspace(0.0, 1.0, length, dtype=np.float32)
+    samples[:length] *= ramp
+    samples[-length:] *= ramp[::-1]
+    return samples
+
+def process_voice_file(path):
+    """处理单个语音文件，返回 (首部裁掉秒数, 尾部裁掉秒数, 处理后时长)"""
+    samples = decode(path)
+    samples, head, tail = trim_silence(samples)
+    samples = apply_fades(normalize(samples))
+    encode(samples, path)
+    return head / TARGET_SAMPLE_RATE, tail / TARGET_SAMPLE_RATE, len(samples) / TARGET_SAMPLE_RATE
+
+def main():
+    """主函数"""
+    # 检查目录
+    if not os.path.exists(SOUNDS_DIR):
+        print(f"❌ 目录不存在: {SOUNDS_DIR}")
+        sys.exit(1)
+
+    print("🎵 Mathaxy 语音文件后处理工具")
+    print("=============================")
+    print()
+
+    # 检查依赖
+    if np is None:
+        print("⚠️  缺少依赖库 numpy")
+        print("请运行: pip3 install numpy")
+        sys.exit(1)
+    if shutil.which('ffmpeg') is None:
+        print("⚠️  缺少 ffmpeg")
+        print("请安装: brew install ffmpeg")
+        sys.exit(1)
+
+    voice_files = find_voice_files()
+    cache = load_cache()
+
+    # 跳过参数未变且内容与上次处理结果一致的文件
+    pending = []
+    for path in voice_files:
+        entry = cache.get(os.path.basename(path))
+        if entry and entry.get('params') == PARAMS_KEY and entry.get('hash') == file_hash(path):
+            continue
+        pending.append(path)
+
+    print(f"📁 语音目录: {SOUNDS_DIR}")
+    print(f"🔊 语音文件: {len(voice_files)} 个")
+    print(f"💾 缓存命中: {len(voice_files) - len(pending)} 个")
+    print()
+
+    success_count = 0
+    fail_count = 0
+
+    # ffmpeg 子进程与 numpy 运算都会释放 GIL，线程池即可并行
+    with ThreadPoolExecutor(max_workers=os.cpu_count()) as executor:
+        futures = {path: executor.submit(process_voice_file, path) for path in pending}
+        for path, future in futures.items():
+            name = os.path.basename(path)
+            try:
+                head, tail, duration = future.result()
+            except (subprocess.CalledProcessError, OSError, ValueError) as e:
+                print(f"❌ 处理失败 {name}: {str(e)}")
+                fail_count += 1
+                continue
+            cache[name] = {'params': PARAMS_KEY, 'hash': file_hash(path)}
+            print(f"✅ {name}: 裁掉首部 {head * 1000:.0f}ms / 尾部 {tail * 1000:.0f}ms，时长 {duration:.2f}s")
+            success_count += 1
+
+    save_cache(cache)
+
+    print()
+    print("=============================")
+    print("🎉 语音文件后处理完成！")
+    print(f"✅ 成功: {success_count} 个")
+    print(f"❌ 失败: {fail_count} 个")
+    return 1 if fail_count else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
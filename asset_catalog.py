@@ -0,0 +1,258 @@
+#!/usr/bin/env python3
+"""
+Assets.xcassets 索引与修复工具（替代 fix_assets_json.sh / repair_assets.sh）：
+1. 一次遍历建立所有 imageset / appiconset 的内存索引
+   （Contents.json 条目、磁盘文件、从文件头读取的像素尺寸）
+2. 查找失效引用、缺失倍率、孤立文件和缺失的 Contents.json
+3. 批量修复，Contents.json 原子写入，只改写有变化的文件
+
+用法：
+    python3 asset_catalog.py                    # 只报告
+    python3 asset_catalog.py --fix              # 修复 Contents.json
+    python3 asset_catalog.py --fix --remove-orphans   # 同时删除未被引用的图片
+"""
+
+import os
+import re
+import sys
+import json
+import argparse
+import tempfile
+
+from asset_headers import probe
+
+# 根目录
+ROOT_DIR = os.path.dirname(os.path.abspath(__file__))
+CATALOG_DIR = os.path.join(ROOT_DIR, "MathaxyAI", "MathaxyAI-iOS", "Mathaxy", "Resources", "Assets.xcassets")
+
+IMAGE_EXTENSIONS = ('.png', '.jpg', '.jpeg', '.pdf', '.svg')
+SCALES = ('1x', '2x', '3x')
+SCALE_SUFFIX = re.compile(r'@([23])x$')
+DEFAULT_INFO = {"author": "xcode", "version": 1}
+
+def file_scale(filename):
+    """根据文件名后缀（@2x / @3x）推断倍率"""
+    match = SCALE_SUFFIX.search(os.path.splitext(filename)[0])
+    return f"{match.group(1)}x" if match else '1x'
+
+def index_set(set_dir):
+    """索引单个 imageset / appiconset"""
+    asset_set = {
+        'path': set_dir,
+        'name': os.path.basename(set_dir),
+        'kind': os.path.splitext(set_dir)[1][1:],
+        'contents': None,
+        'files': {},
+    }
+    contents_path = os.path.join(set_dir, "Contents.json")
+    if os.path.exists(contents_path):
+        try:
+            with open(contents_path, 'r', encoding='utf-8') as f:
+                asset_set['contents'] = json.load(f)
+        except ValueError as e:
+            asset_set['error'] = str(e)
+
+    for filename in os.listdir(set_dir):
+        if filename.lower().endswith(IMAGE_EXTENSIONS):
+            info = probe(os.path.join(set_dir, filename)) if filename.lower().endswith(('.png', '.jpg', '.jpeg')) else {}
+            asset_set['files'][filename] = info
+    return asset_set
+
+def index_catalog(catalog_dir=CATALOG_DIR):
+    """索引整个资源目录，返回 [asset_set, ...]"""
+    sets = []
+    for root, dirs, files in os.walk(catalog_dir):
+        for name in list(dirs):
+            if name.endswith(('.imageset', '.appiconset')):
+                sets.append(index_set(os.path.join(root, name)))
+                dirs.remove(name)
+    sets.sort(key=lambda s: s['path'])
+    return sets
+
+def is_single_scale(images):
+    """没有 scale 字段的条目表示单一尺寸（矢量）资源，不需要补齐倍率"""
+    return any(entry.get('idiom', 'universal') == 'universal' and 'scale' not in entry for entry in images)
+
+def needs_all_scales(asset_set, images):
+    """是否需要 1x/2x/3x 齐全
+
+    只填 1x 的位图是合法的（按 1x 缩放显示）；已声明多个倍率、
+    或磁盘上存在 @2x/@3x 文件时，才认为该资源集应当补齐倍率。
+    """
+    if is_single_scale(images):
+        return False
+    declared = {e.get('scale') for e in images if e.get('idiom', 'universal') == 'universal' and e.get('filename')}
+    return len(declared) > 1 or any(file_scale(f) != '1x' for f in asset_set['files'])
+
+def referenced_files(asset_set):
+    """Contents.json 引用的文件名集合"""
+    images = (asset_set['contents'] or {}).get('images', [])
+    return {entry['filename'] for entry in images if entry.get('filename')}
+
+def find_issues(asset_set):
+    """返回该资源集的问题列表 [(类型, 描述), ...]"""
+    if 'error' in asset_set:
+        return [('invalid', f"Contents.json 无法解析: {asset_set['error']}")]
+    if asset_set['contents'] is None:
+        return [('missing_contents', "缺少 Contents.json")]
+
+    issues = []
+    images = asset_set['contents'].get('images', [])
+    for entry in images:
+        filename = entry.get('filename')
+        if filename and filename not in asset_set['files']:
+            issues.append(('dangling', f"引用的文件不存在: {filename}"))
+
+    if asset_set['kind'] == 'imageset' and needs_all_scales(asset_set, images):
+        present = {entry.get('scale') for entry in images if entry.get('idiom', 'universal') == 'universal'}
+        missing = [s for s in SCALES if s not in present]
+        if missing:
+            issues.append(('missing_scale', f"缺少倍率: {', '.join(missing)}"))
+    elif asset_set['kind'] == 'appiconset':
+        for entry in images:
+            if entry.get('filename') in asset_set['files'] and 'size' in entry:
+                info = asset_set['files'][entry['filename']]
+                expected = expected_icon_size(entry)
+                if info.get('width') and (info['width'], info['height']) != expected:
+                    issues.append(('size', f"{entry['filename']} 应为 {expected[0]}x{expected[1]}，"
+                                           f"实际为 {info['width']}x{info['height']}"))
+
+    for filename in sorted(set(asset_set['files']) - referenced_files(asset_set)):
+        issues.append(('orphan', f"未被引用的文件: {filename}"))
+    return issues
+
+def expected_icon_size(entry):
+    """图标条目要求的像素尺寸"""
+    scale = float(entry.get('scale', '1x').rstrip('x'))
+    width, height = (float(v) for v in entry['size'].split('x'))
+    return round(width * scale), round(height * scale)
+
+def pick_orphan(orphans, scale):
+    """为指定倍率挑选一个未被引用的同倍率文件（优先 PNG）"""
+    candidates = sorted((f for f in orphans if file_scale(f) == scale and not f.lower().endswith('.svg')),
+                        key=lambda f: (not f.lower().endswith('.png'), f))
+    return candidates[0] if candidates else None
+
+def repair_set(asset_set):
+    """修复单个资源集，返回修复后的 Contents.json（无需修改时返回 None）"""
+    if 'error' in asset_set or asset_set['contents'] is None:
+        # 根据磁盘上的文件重建
+        contents = {"images": [{"idiom": "universal", "scale": s} for s in SCALES], "info": dict(DEFAULT_INFO)}
+        if asset_set['kind'] == 'appiconset':
+            return None
+    else:
+        contents = json.loads(json.dumps(asset_set['contents']))
+    images = contents.setdefault('images', [])
+    orphans = set(asset_set['files']) - {e.get('filename') for e in images}
+
+    # 失效引用：换成同倍率的孤立文件，没有则清空
+    for entry in images:
+        filename = entry.get('filename')
+        if filename and filename not in asset_set['files']:
+            replacement = pick_orphan(orphans, entry.get('scale', '1x')) if 'size' not in entry else None
+            if replacement:
+                entry['filename'] = replacement
+                orphans.discard(replacement)
+            else:
+                del entry['filename']
+
+    if asset_set['kind'] == 'imageset' and not is_single_scale(images):
+        # 补齐缺失的倍率
+        if needs_all_scales(asset_set, images):
+            present = {e.get('scale') for e in images if e.get('idiom', 'universal') == 'universal'}
+            for scale in SCALES:
+                if scale not in present:
+                    images.append({"idiom": "universal", "scale": scale})
+            images.sort(key=lambda e: (e.get('idiom', ''), e.get('scale', '')))
+        # 空位只填入文件名倍率相同的孤立文件；低倍率图片放进高倍率空位会按一半/三分之一尺寸绘制
+        for entry in images:
+            if entry.get('idiom', 'universal') == 'universal' and not entry.get('filename'):
+                replacement = pick_orphan(orphans, entry.get('scale', '1x'))
+                if replacement:
+                    entry['filename'] = replacement
+                    orphans.discard(replacement)
+    elif asset_set['kind'] == 'appiconset':
+        # 图标空位按像素尺寸填入孤立文件
+        for entry in images:
+            if not entry.get('filename') and 'size' in entry:
+                expected = expected_icon_size(entry)
+                for filename in sorted(orphans):
+                    info = asset_set['files'][filename]
+                    if (info.get('width'), info.get('height')) == expected:
+                        entry['filename'] = filename
+                        orphans.discard(filename)
+                        break
+
+    contents.setdefault('info', dict(DEFAULT_INFO))
+    if contents == asset_set['contents']:
+        return None
+    return contents
+
+def write_contents(set_dir, contents):
+    """以 Xcode 的格式原子写入 Contents.json"""
+    text = json.dumps(contents, ensure_ascii=False, indent=2, separators=(',', ' : '), sort_keys=True) + "\n"
+    fd, tmp_path = tempfile.mkstemp(dir=set_dir, suffix='.json')
+    with os.fdopen(fd, 'w', encoding='utf-8') as f:
+        f.write(text)
+    os.replace(tmp_path, os.path.join(set_dir, "Contents.json"))
+
+def main():
+    """主函数"""
+    parser = argparse.ArgumentParser(description="Mathaxy Assets.xcassets 索引与修复工具")
+    parser.add_argument('--fix', action='store_true', help="修复 Contents.json")
+    parser.add_argument('--remove-orphans', action='store_true', help="删除修复后仍未被引用的图片")
+    parser.add_argument('--catalog', default=CATALOG_DIR, help="Assets.xcassets 路径")
+    args = parser.parse_args()
+
+    print("🔧 Mathaxy Assets.xcassets 索引与修复工具")
+    print("=====================================")
+    print()
+
+    if not os.path.isdir(args.catalog):
+        print(f"❌ 目录不存在: {args.catalog}")
+        sys.exit(1)
+
+    sets = index_catalog(args.catalog)
+    file_count = sum(len(s['files']) for s in sets)
+    print(f"📦 资源集: {len(sets)} 个，图片文件: {file_count} 个")
+    print()
+
+    issue_count = 0
+    for asset_set in sets:
+        for _, message in find_issues(asset_set):
+            print(f"⚠️  {asset_set['name']}: {message}")
+            issue_count += 1
+
+    print()
+    print(f"📊 发现问题: {issue_count} 个")
+    if not args.fix:
+        if issue_count:
+            print("提示: 使用 --fix 自动修复")
+        return 0
+
+    fixed_count = 0
+    removed_count = 0
+    for asset_set in sets:
+        contents = repair_set(asset_set)
+        if contents is not None:
+            write_contents(asset_set['path'], contents)
+            asset_set['contents'] = contents
+            asset_set.pop('error', None)
+            fixed_count += 1
+            print(f"✅ 修复: {asset_set['name']}")
+        if args.remove_orphans and asset_set['contents'] is not None:
+            for filename in sorted(set(asset_set['files']) - referenced_files(asset_set)):
+                os.remove(os.path.join(asset_set['path'], filename))
+                removed_count += 1
+                print(f"🗑  删除: {asset_set['name']}/{filename}")
+
+    print()
+    print("=====================================")
+    print("🎉 修复完成！")
+    print(f"📝 更新 Contents.json: {fixed_count} 个")
+    if args.remove_orphans:
+        print(f"🗑  删除孤立文件: {removed_count} 个")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,219 @@
+#!/usr/bin/env python3
+"""
+资源文件头解析：
+只读取容器头部（小范围 seek + read），不解码音频或图片数据，
+提取格式、采样率、声道、时长和图片尺寸。
+
+支持 WAV、MP3、M4A/MP4、PNG、JPEG。
+"""
+
+import os
+import struct
+
+HEADER_SIZE = 64 * 1024
+
+# MP3 帧头表：[MPEG 版本][层] -> 比特率（kbps）
+MP3_BITRATES = {
+    (1, 1): [0, 32, 64, 96, 128, 160, 192, 224, 256, 288, 320, 352, 384, 416, 448],
+    (1, 2): [0, 32, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320, 384],
+    (1, 3): [0, 32, 40, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320],
+    (2, 1): [0, 32, 48, 56, 64, 80, 96, 112, 128, 144, 160, 176, 192, 224, 256],
+    (2, 2): [0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160],
+    (2, 3): [0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160],
+}
+MP3_SAMPLE_RATES = {1: [44100, 48000, 32000], 2: [22050, 24000, 16000], 2.5: [11025, 12000, 8000]}
+# MP4 容器中需要向下展开的原子
+MP4_CONTAINERS = {b'moov', b'trak', b'mdia', b'minf', b'stbl'}
+AUDIO_FORMATS = {'wav', 'mp3', 'm4a'}
+IMAGE_FORMATS = {'png', 'jpeg'}
+
+def probe_wav(f, file_size):
+    """解析 WAV：fmt 块与 data 块长度"""
+    info = {'format': 'wav'}
+    f.seek(12)
+    while True:
+        chunk = f.read(8)
+        if len(chunk) < 8:
+            break
+        chunk_id, chunk_size = struct.unpack('<4sI', chunk)
+        if chunk_id == b'fmt ':
+            fmt = f.read(16)
+            _, channels, sample_rate, byte_rate, _, bits = struct.unpack('<HHIIHH', fmt)
+            info.update(channels=channels, sample_rate=sample_rate, bits=bits, byte_rate=byte_rate)
+            f.seek(chunk_size - 16 + (chunk_size & 1), os.SEEK_CUR)
+        elif chunk_id == b'data':
+            data_size = min(chunk_size, file_size - f.tell())
+            info['data_size'] = data_size
+            if info.get('byte_rate'):
+                info['duration'] = data_size / info['byte_rate']
+            break
+        else:
+            f.seek(chunk_size + (chunk_size & 1), os.SEEK_CUR)
+    return info
+
+def parse_mp3_frame(header):
+    """解析 4 字节 MP3 帧头，非法时返回 None"""
+    value = struct.unpack('>I', header)[0]
+    if value >> 21 != 0x7FF:
+        return None
+    version_bits = (value >> 19) & 3
+    layer_bits = (value >> 17) & 3
+    bitrate_index = (value >> 12) & 0xF
+    rate_index = (value >> 10) & 3
+    if version_bits == 1 or layer_bits == 0 or bitrate_index in (0, 15) or rate_index == 3:
+        return None
+    version = {3: 1, 2: 2, 0: 2.5}[version_bits]
+    layer = 4 - layer_bits
+    bitrate = MP3_BITRATES[(1 if version == 1 else 2, layer)][bitrate_index]
+    return {
+        'version': version,
+        'layer': layer,
+        'bitrate': bitrate,
+        'sample_rate': MP3_SAMPLE_RATES[version][rate_index],
+        'channels': 1 if (value >> 6) & 3 == 3 else 2,
+        # Layer I 固定 384；Layer II 固定 1152；Layer III 在 MPEG-2/2.5 下减半为 576
+        'samples_per_frame': 384 if layer == 1 else (1152 if layer == 2 or version == 1 else 576),
+    }
+
+def probe_mp3(f, file_size):
+    """解析 MP3：跳过 ID3v2，定位第一帧，优先读取 Xing/Info 帧数"""
+    info = {'format': 'mp3'}
+    head = f.read(10)
+    offset = 0
+    if head[:3] == b'ID3' and len(head) == 10:
+        # ID3v2 长度为 syncsafe 整数
+        size = (head[6] << 21) | (head[7] << 14) | (head[8] << 7) | head[9]
+        offset = 10 + size
+    f.seek(offset)
+    data = f.read(HEADER_SIZE)
+
+    for i in range(len(data) - 3):
+        if data[i] != 0xFF:
+            continue
+        frame = parse_mp3_frame(data[i:i + 4])
+        if frame is None:
+            continue
+        info.update(sample_rate=frame['sample_rate'], channels=frame['channels'], bitrate=frame['bitrate'])
+        audio_size = file_size - offset - i
+        xing = max(data.find(b'Xing', i, i + 64), data.find(b'Info', i, i + 64))
+        if xing != -1 and len(data) >= xing + 12 and struct.unpack('>I', data[xing + 4:xing + 8])[0] & 1:
+            frames = struct.unpack('>I', data[xing + 8:xing + 12])[0]
+            info['duration'] = frames * frame['samples_per_frame'] / frame['sample_rate']
+        else:
+            info['duration'] = audio_size * 8 / (frame['bitrate'] * 1000)
+        return info
+
+    # 只有 ID3 标签、没有音频帧
+    info['placeholder'] = True
+    return info
+
+def iter_mp4_atoms(f, start, end):
+    """遍历 [start, end) 范围内的 MP4 原子，产出 (类型, 内容起点, 内容终点)"""
+    position = start
+    while position + 8 <= end:
+        f.seek(position)
+        header = f.read(8)
+        if len(header) < 8:
+            return
+        size, atom_type = struct.unpack('>I4s', header)
+        header_size = 8
+        if size == 1:
+            size = struct.unpack('>Q', f.read(8))[0]
+            header_size = 16
+        elif size == 0:
+            size = end - position
+        if size < header_size:
+            return
+        yield atom_type, position + header_size, position + size
+        position += size
+
+def probe_mp4(f, file_size):
+    """解析 M4A/MP4：mdhd 的时长与 stsd 中音频条目的声道、采样率"""
+    info = {'format': 'm4a'}
+
+    def walk(start, end):
+        for atom_type, body, atom_end in iter_mp4_atoms(f, start, end):
+            if atom_type in MP4_CONTAINERS:
+                walk(body, atom_end)
+            elif atom_type == b'mdhd' and 'duration' not in info:
+                f.seek(body)
+                version = f.read(4)[0]
+                if version == 1:
+                    timescale, duration = struct.unpack('>16xIQ', f.read(28))
+                else:
+                    timescale, duration = struct.unpack('>8xII', f.read(16))
+                if timescale:
+                    info['duration'] = duration / timescale
+            elif atom_type == b'stsd' and 'channels' not in info:
+                # 版本/标志(4) + 条目数(4) + 条目大小(4) + 编码(4) + 保留(6) + 索引(2) + 保留(8)
+                f.seek(body + 8)
+                entry = f.read(36)
+                if len(entry) == 36:
+                    info['codec'] = entry[4:8].decode('latin-1')
+                    channels, bits = struct.unpack('>HH', entry[24:28])
+                    sample_rate = struct.unpack('>I', entry[32:36])[0] >> 16
+                    info.update(channels=channels, bits=bits, sample_rate=sample_rate)
+
+    walk(0, file_size)
+    if 'duration' not in info:
+        info['placeholder'] = True
+    return info
+
+def probe_png(f, file_size):
+    """解析 PNG：IHDR 中的宽高、位深与颜色类型"""
+    f.seek(16)
+    width, height, bits, color_type = struct.unpack('>IIBB', f.read(10))
+    return {'format': 'png', 'width': width, 'height': height, 'bits': bits, 'color_type': color_type}
+
+def probe_jpeg(f, file_size):
+    """解析 JPEG：顺序扫描段标记直到 SOFn"""
+    f.seek(2)
+    while True:
+        marker = f.read(2)
+        if len(marker) < 2 or marker[0] != 0xFF:
+            return {'format': 'jpeg', 'placeholder': True}
+        code = marker[1]
+        if code == 0xFF:
+            f.seek(-1, os.SEEK_CUR)
+            continue
+        if code in (0xD8, 0x01) or 0xD0 <= code <= 0xD7:
+            continue
+        length = struct.unpack('>H', f.read(2))[0]
+        if 0xC0 <= code <= 0xCF and code not in (0xC4, 0xC8, 0xCC):
+            bits, height, width, components = struct.unpack('>BHHB', f.read(6))
+            return {'format': 'jpeg', 'width': width, 'height': height, 'bits': bits, 'channels': components}
+        f.seek(length - 2, os.SEEK_CUR)
+
+def probe(path):
+    """读取文件头并返回资源信息字典
+
+    至少包含 format（无法识别时为 None）和 size；
+    'placeholder' 为 True 表示文件只有头部、没有实际内容；
+    'corrupt' 为 True 表示文件头被截断或已损坏，无法解析。
+    """
+    file_size = os.path.getsize(path)
+    with open(path, 'rb') as f:
+        magic = f.read(12)
+        f.seek(0)
+        if magic[:4] == b'RIFF' and magic[8:12] == b'WAVE':
+            file_format, parser = 'wav', probe_wav
+        elif magic[:8] == b'\x89PNG\r\n\x1a\n':
+            file_format, parser = 'png', probe_png
+        elif magic[:2] == b'\xff\xd8':
+            file_format, parser = 'jpeg', probe_jpeg
+        elif magic[4:8] == b'ftyp':
+            file_format, parser = 'm4a', probe_mp4
+        elif magic[:3] == b'ID3' or (len(magic) >= 2 and magic[0] == 0xFF and magic[1] & 0xE0 == 0xE0):
+            file_format, parser = 'mp3', probe_mp3
+        else:
+            file_format, parser = None, None
+
+        info = {'format': file_format}
+        if parser:
+            try:
+                info = parser(f, file_size)
+            except (struct.error, IndexError, ValueError):
+                # 头部字段读不全（截断）或取值非法
+                info = {'format': file_format, 'placeholder': True, 'corrupt': True}
+    info['size'] = file_size
+    return info
@@ -0,0 +1,235 @@
+#!/usr/bin/env python3
+"""
+App Store 截图批量合成工具：
+1. 每张原始截图只解码一次，加上设备边框后生成一份最大尺寸的母版
+2. 各设备尺寸从母版缩放，背景按尺寸缓存，只重新绘制标题文字
+3. 按 (截图, 标题, 尺寸) 的哈希增量跳过，修改某个语言的标题只重新生成该语言
+4. 多进程并行输出
+
+目录结构：
+    screenshots/raw/<iphone|ipad>/<语言>/<序号_页面>.png   原始截图
+    screenshots/captions.json                             {"<序号_页面>": {"<语言>": "标题"}}
+    screenshots/output/<语言>/<设备>/<序号_页面>.png        输出
+
+用法：
+    python3 compose_screenshots.py
+    python3 compose_screenshots.py --force   # 忽略增量缓存，全部重新生成
+"""
+
+import os
+import sys
+import json
+import hashlib
+import argparse
+import functools
+from concurrent.futures import ProcessPoolExecutor
+from PIL import Image, ImageDraw
+
+from render_certificates import fit_font, font_path
+
+# 根目录
+ROOT_DIR = os.path.dirname(os.path.abspath(__file__))
+SCREENSHOTS_DIR = os.path.join(ROOT_DIR, "screenshots")
+RAW_DIR = os.path.join(SCREENSHOTS_DIR, "raw")
+CAPTIONS_PATH = os.path.join(SCREENSHOTS_DIR, "captions.json")
+OUTPUT_DIR = os.path.join(SCREENSHOTS_DIR, "output")
+MANIFEST_PATH = os.path.join(OUTPUT_DIR, ".manifest.json")
+
+# 各设备的截图尺寸（见 App Store截图指南.md）
+DEVICE_SIZES = {
+    "iphone": [
+        ("6.7", (1290, 2796)),
+        ("6.5", (1242, 2688)),
+        ("6.1", (1170, 2532)),
+    ],
+    "ipad": [
+        ("12.9", (2048, 2732)),
+        ("11", (1668, 2388)),
+        ("10.9", (1640, 2360)),
+    ],
+}
+
+# 版式（按画布宽度的比例）
+CAPTION_TOP = 0.06
+CAPTION_SIZE = 0.065
+DEVICE_TOP = 0.16
+DEVICE_WIDTH = 0.78
+BEZEL = 0.035          # 边框宽度（相对设备宽度）
+CORNER_RADIUS = 0.12   # 圆角（相对设备宽度）
+BACKGROUND_TOP = (36, 24, 96)
+BACKGROUND_BOTTOM = (10, 8, 40)
+BEZEL_COLOR = (24, 24, 28, 255)
+CAPTION_COLOR = (255, 214, 102, 255)
+
+# 版式变化时修改，使已有输出全部失效
+LAYOUT_VERSION = 1
+
+def file_hash(path):
+    """计算文件 SHA-256"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def output_key(capture_hash, caption, size):
+    """单个输出文件的增量哈希"""
+    return hashlib.sha256(json.dumps([LAYOUT_VERSION, capture_hash, caption, size]).encode('utf-8')).hexdigest()
+
+@functools.lru_cache(maxsize=None)
+def background(size):
+    """按尺寸缓存的竖向渐变背景"""
+    width, height = size
+    column = Image.new("RGBA", (1, height))
+    for y in range(height):
+        t = y / max(1, height - 1)
+        column.putpixel((0, y), tuple(round(a + (b - a) * t) for a, b in zip(BACKGROUND_TOP, BACKGROUND_BOTTOM)) + (255,))
+    return column.resize(size, Image.Resampling.NEAREST)
+
+def device_box(size):
+    """设备边框在画布中的位置与尺寸"""
+    width, height = size
+    device_width = round(width * DEVICE_WIDTH)
+    return device_width, round(height * DEVICE_TOP)
+
+def frame_capture(capture, device_width):
+    """把截图缩放后加上圆角设备边框"""
+    bezel = round(device_width * BEZEL)
+    screen_width = device_width - 2 * bezel
+    screen_height = round(capture.height * screen_width / capture.width)
+    screen = capture.resize((screen_width, screen_height), Image.Resampling.LANCZOS)
+
+    radius = round(device_width * CORNER_RADIUS)
+    framed = Image.new("RGBA", (device_width, screen_height + 2 * bezel), (0, 0, 0, 0))
+    ImageDraw.Draw(framed).rounded_rectangle((0, 0, framed.width - 1, framed.height - 1), radius=radius, fill=BEZEL_COLOR)
+    mask = Image.new("L", screen.size, 0)
+    ImageDraw.Draw(mask).rounded_rectangle((0, 0, screen_width - 1, screen_height - 1), radius=max(0, radius - bezel), fill=255)
+    framed.paste(screen, (bezel, bezel), mask)
+    return framed
+
+def compose(framed_master, caption, size):
+    """在缓存背景上放置缩放后的设备图并绘制标题"""
+    width, height = size
+    device_width, device_top = device_box(size)
+    device_height = round(framed_master.height * device_width / framed_master.width)
+    device = framed_master.resize((device_width, device_height), Image.Resampling.LANCZOS)
+
+    canvas = background(size).copy()
+    canvas.alpha_composite(device, ((width - device_width) // 2, device_top))
+    if caption:
+        draw = ImageDraw.Draw(canvas)
+        font = fit_font(draw, caption, round(width * CAPTION_SIZE), max_width=round(width * 0.9))
+        text_width = draw.textlength(caption, font=font)
+        draw.text(((width - text_width) / 2, round(height * CAPTION_TOP)), caption, font=font, fill=CAPTION_COLOR)
+    return canvas.convert("RGB")
+
+def render_capture(job):
+    """处理一张原始截图的所有待生成尺寸，返回 [(输出路径, 增量哈希), ...]
+
+    截图只解码一次，边框母版按最大目标宽度生成一次，各尺寸都从母版缩放。
+    """
+    with Image.open(job["capture"]) as capture:
+        capture = capture.convert("RGBA")
+    master_width = max(device_box(size)[0] for _, size, _, _ in job["targets"])
+    framed_master = frame_capture(capture, master_width)
+
+    results = []
+    for output, size, caption, key in job["targets"]:
+        os.makedirs(os.path.dirname(output), exist_ok=True)
+        compose(framed_master, caption, tuple(size)).save(output, "PNG", compress_level=1)
+        results.append((output, key))
+    return results
+
+def load_json(path):
+    """读取 JSON 文件，不存在时返回空字典"""
+    if not os.path.exists(path):
+        return {}
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+def build_jobs(captions, manifest, force=False):
+    """扫描原始截图，生成需要重新输出的任务，返回 (任务列表, 跳过数)"""
+    jobs = []
+    skipped = 0
+    for family, sizes in DEVICE_SIZES.items():
+        family_dir = os.path.join(RAW_DIR, family)
+        if not os.path.isdir(family_dir):
+            continue
+        for language in sorted(os.listdir(family_dir)):
+            language_dir = os.path.join(family_dir, language)
+            if not os.path.isdir(language_dir):
+                continue
+            for filename in sorted(os.listdir(language_dir)):
+                if not filename.lower().endswith(('.png', '.jpg', '.jpeg')):
+                    continue
+                capture = os.path.join(language_dir, filename)
+                name = os.path.splitext(filename)[0]
+                caption = captions.get(name, {}).get(language, "")
+                capture_hash = file_hash(capture)
+
+                targets = []
+                for device, size in sizes:
+                    output = os.path.join(OUTPUT_DIR, language, f"{family}_{device}", name + ".png")
+                    key = output_key(capture_hash, caption, size)
+                    if not force and manifest.get(os.path.relpath(output, OUTPUT_DIR)) == key and os.path.exists(output):
+                        skipped += 1
+                        continue
+                    targets.append((output, size, caption, key))
+                if targets:
+                    jobs.append({"capture": capture, "targets": targets})
+    return jobs, skipped
+
+def main():
+    """主函数"""
+    parser = argparse.ArgumentParser(description="Mathaxy App Store 截图合成工具")
+    parser.add_argument('--force', action='store_true', help="忽略增量缓存，全部重新生成")
+    args = parser.parse_args()
+
+    print("📸 Mathaxy App Store 截图合成工具")
+    print("===============================")
+    print()
+
+    if not os.path.isdir(RAW_DIR):
+        print(f"❌ 原始截图目录不存在: {RAW_DIR}")
+        sys.exit(1)
+    if font_path() is None:
+        print("⚠️  未找到 CJK 字体，将使用 Pillow 默认字体（中日韩文字无法显示）")
+
+    captions = load_json(CAPTIONS_PATH)
+    manifest = load_json(MANIFEST_PATH)
+    jobs, skipped = build_jobs(captions, manifest, args.force)
+    total = sum(len(job["targets"]) for job in jobs)
+
+    print(f"📁 输出目录: {OUTPUT_DIR}")
+    print(f"📝 需要生成: {total} 张（跳过未变化的 {skipped} 张）")
+    print()
+
+    success_count = 0
+    fail_count = 0
+    with ProcessPoolExecutor() as executor:
+        futures = [executor.submit(render_capture, job) for job in jobs]
+        for job, future in zip(jobs, futures):
+            try:
+                results = future.result()
+            except Exception as e:
+                print(f"❌ 生成失败 {os.path.relpath(job['capture'], RAW_DIR)}: {str(e)}")
+                fail_count += len(job["targets"])
+                continue
+            for output, key in results:
+                manifest[os.path.relpath(output, OUTPUT_DIR)] = key
+                print(f"✅ {os.path.relpath(output, OUTPUT_DIR)}")
+            success_count += len(results)
+
+    os.makedirs(OUTPUT_DIR, exist_ok=True)
+    with open(MANIFEST_PATH, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2, sort_keys=True)
+
+    print()
+    print("===============================")
+    print("🎉 截图合成完成！")
+    print(f"✅ 成功: {success_count} 张")
+    print(f"❌ 失败: {fail_count} 张")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,239 @@
+#!/usr/bin/env python3
+"""
+资源去重工具：
+1. 按 文件大小 -> 头部哈希 -> 完整哈希 三级索引所有资源文件
+2. 报告重复文件组及可回收的字节数
+3. 可选：合并为唯一的规范副本，并更新 project.pbxproj 中的引用
+
+用法：
+    python3 dedup_resources.py            # 只报告
+    python3 dedup_resources.py --apply    # 删除包外的重复副本
+    python3 dedup_resources.py --apply --include-bundle  # 同时合并应用包内的同名重复
+"""
+
+import os
+import re
+import sys
+import shutil
+import hashlib
+import argparse
+import tempfile
+from collections import defaultdict
+
+# 仓库根目录
+ROOT_DIR = os.path.dirname(os.path.abspath(__file__))
+# Xcode 项目目录
+PROJECT_DIR = os.path.join(ROOT_DIR, "MathaxyAI", "MathaxyAI-iOS")
+PBXPROJ_PATH = os.path.join(PROJECT_DIR, "Mathaxy.xcodeproj", "project.pbxproj")
+# 打包进应用的资源目录（规范副本优先保留在这里）
+BUNDLE_RESOURCES_DIR = os.path.join(PROJECT_DIR, "Mathaxy", "Resources")
+
+# 参与去重的资源类型
+RESOURCE_EXTENSIONS = {'.png', '.jpg', '.jpeg', '.mp3', '.m4a', '.wav', '.aac', '.spec', '.info'}
+# 不扫描的目录
+SKIP_DIRS = {'.git', 'build', '__pycache__'}
+
+PARTIAL_HASH_SIZE = 64 * 1024
+CHUNK_SIZE = 1024 * 1024
+
+def scan_resource_files(root_dir):
+    """扫描所有资源文件，返回 {文件大小: [路径, ...]}
+
+    空文件（占位文件）互相之间不算重复，直接跳过。
+    """
+    by_size = defaultdict(list)
+    for root, dirs, files in os.walk(root_dir):
+        dirs[:] = [d for d in dirs if d not in SKIP_DIRS]
+        for file in files:
+            if os.path.splitext(file)[1].lower() not in RESOURCE_EXTENSIONS:
+                continue
+            path = os.path.join(root, file)
+            if os.path.islink(path):
+                continue
+            size = os.path.getsize(path)
+            if size:
+                by_size[size].append(path)
+    return by_size
+
+def file_hash(path, limit=None):
+    """计算文件的 SHA-256，limit 不为空时只读取头部 limit 字节"""
+    digest = hashlib.sha256()
+    remaining = limit
+    with open(path, 'rb') as f:
+        while True:
+            size = CHUNK_SIZE if remaining is None else min(CHUNK_SIZE, remaining)
+            data = f.read(size)
+            if not data:
+                break
+            digest.update(data)
+            if remaining is not None:
+                remaining -= len(data)
+                if remaining <= 0:
+                    break
+    return digest.hexdigest()
+
+def group_by(paths, key):
+    """按 key 分组，只保留包含多个文件的组"""
+    groups = defaultdict(list)
+    for path in paths:
+        groups[key(path)].append(path)
+    return [g for g in groups.values() if len(g) > 1]
+
+def find_duplicates(root_dir):
+    """查找重复文件，返回 [(文件大小, [路径, ...]), ...]
+
+    同大小的文件才计算头部哈希，头部相同的才计算完整哈希，
+    绝大多数文件只需要一次 stat。
+    """
+    duplicates = []
+    # in_bundle 需要与绝对路径 BUNDLE_RESOURCES_DIR 比较
+    for size, paths in scan_resource_files(os.path.abspath(root_dir)).items():
+        if len(paths) < 2:
+            continue
+        if size > PARTIAL_HASH_SIZE:
+            candidates = group_by(paths, lambda p: file_hash(p, PARTIAL_HASH_SIZE))
+        else:
+            candidates = [paths]
+        for candidate in candidates:
+            for group in group_by(candidate, file_hash):
+                duplicates.append((size, sorted(group, key=canonical_rank)))
+    duplicates.sort(key=lambda d: d[0] * (len(d[1]) - 1), reverse=True)
+    return duplicates
+
+def in_bundle(path):
+    """文件是否位于应用包资源目录中"""
+    return os.path.commonpath([path, BUNDLE_RESOURCES_DIR]) == BUNDLE_RESOURCES_DIR
+
+def canonical_rank(path):
+    """规范副本排序：应用包内优先，其次目录层级浅、路径短的"""
+    return (not in_bundle(path), path.count(os.sep), len(path), path)
+
+def format_size(size):
+    """格式化字节数"""
+    for unit in ('B', 'KB', 'MB'):
+        if size < 1024:
+            return f"{size:.1f} {unit}" if unit != 'B' else f"{size} B"
+        size /= 1024
+    return f"{size:.1f} GB"
+
+def sync_roots(pbxproj_text):
+    """解析 PBXFileSystemSynchronizedRootGroup 的路径（相对于项目目录）"""
+    roots = re.findall(
+        r'isa = PBXFileSystemSynchronizedRootGroup;\s*path = "?([^";]+)"?;', pbxproj_text)
+    return [os.path.join(PROJECT_DIR, r) for r in roots]
+
+def update_pbxproj_references(replacements, pbxproj_path=PBXPROJ_PATH):
+    """把 project.pbxproj 中指向被删除副本的路径改为规范副本，返回修改处数
+
+    路径按项目目录和各个同步根目录两种相对形式匹配。
+    """
+    if not replacements or not os.path.exists(pbxproj_path):
+        return 0
+
+    with open(pbxproj_path, 'r', encoding='utf-8') as f:
+        content = f.read()
+
+    bases = [PROJECT_DIR] + sync_roots(content)
+    changes = 0
+    for removed, canonical in replacements.items():
+        for base in bases:
+            old = os.path.relpath(removed, base)
+            new = os.path.relpath(canonical, base)
+            if old.startswith('..') or new.startswith('..'):
+                continue
+            for old_token, new_token in ((f'"{old}"', f'"{new}"'), (old, new)):
+                pattern = re.compile(r'(?<=[\s=(,])' + re.escape(old_token) + r'(?=[\s;,)])')
+                content, count = pattern.subn(lambda m: new_token, content)
+                changes += count
+
+    if changes:
+        backup_path = pbxproj_path + '.backup_dedup'
+        if not os.path.exists(backup_path):
+            shutil.copy(pbxproj_path, backup_path)
+        # 原子写入
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(pbxproj_path))
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            f.write(content)
+        os.replace(tmp_path, pbxproj_path)
+    return changes
+
+def removable(path, canonical, include_bundle=False):
+    """副本能否删除
+
+    文件通常被代码或 Contents.json 按名引用，换成不同名的规范副本会找不到资源，
+    因此只删除与规范副本同名的副本；应用包内的副本默认只报告，include_bundle 为 True 时一并合并。
+    """
+    if in_bundle(path) and not include_bundle:
+        return False
+    return os.path.basename(path) == os.path.basename(canonical)
+
+def collapse_duplicates(duplicates, include_bundle=False):
+    """删除可删除的非规范副本，返回 {被删除路径: 规范路径}"""
+    removed = {}
+    for _, paths in duplicates:
+        canonical = paths[0]
+        for path in paths[1:]:
+            if not removable(path, canonical, include_bundle):
+                continue
+            os.remove(path)
+            removed[path] = canonical
+    return removed
+
+def main():
+    """主函数"""
+    parser = argparse.ArgumentParser(description="Mathaxy 资源去重工具")
+    parser.add_argument('--apply', action='store_true', help="删除重复副本（默认只报告）")
+    parser.add_argument('--include-bundle', action='store_true', help="同时合并应用包内的同名重复文件")
+    parser.add_argument('--root', default=ROOT_DIR, help="扫描根目录")
+    args = parser.parse_args()
+    args.root = os.path.abspath(args.root)
+
+    print("🔍 Mathaxy 资源去重工具")
+    print("=====================")
+    print()
+    print(f"📁 扫描目录: {args.root}")
+    print()
+
+    duplicates = find_duplicates(args.root)
+    if not duplicates:
+        print("✅ 未发现重复文件")
+        return 0
+
+    total_wasted = 0
+    bundle_wasted = 0
+    for size, paths in duplicates:
+        # 只统计当前参数下实际可删除的副本
+        extra = [p for p in paths[1:] if removable(p, paths[0], args.include_bundle)]
+        wasted = size * len(extra)
+        total_wasted += wasted
+        bundle_wasted += size * sum(1 for p in extra if in_bundle(p))
+        print(f"📦 {len(paths)} 个副本，{format_size(size)}/个，可回收 {format_size(wasted)}")
+        for i, path in enumerate(paths):
+            if i == 0:
+                marker = "✅"
+            elif not removable(path, paths[0], args.include_bundle):
+                marker = "🔒"
+            else:
+                marker = "  "
+            print(f"   {marker} {os.path.relpath(path, args.root)}")
+
+    print()
+    print("=====================")
+    print(f"📊 重复组: {len(duplicates)} 个")
+    print(f"💾 可回收空间: {format_size(total_wasted)}")
+    print(f"📱 其中打包进应用: {format_size(bundle_wasted)}")
+
+    if not args.apply:
+        print()
+        print("提示: 使用 --apply 删除重复副本（✅ 为保留的规范副本，🔒 为名称不同或位于应用包内、只报告不删除的副本）")
+        return 0
+
+    removed = collapse_duplicates(duplicates, args.include_bundle)
+    changes = update_pbxproj_references(removed)
+    print()
+    print(f"🗑  已删除: {len(removed)} 个文件")
+    print(f"📝 更新 project.pbxproj 引用: {changes} 处")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
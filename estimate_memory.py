@@ -0,0 +1,243 @@
+#!/usr/bin/env python3
+"""
+运行时内存占用估算工具：
+1. 只读取文件头，计算每张图片解码后的位图大小（RGBA）和每个音频解码后的 PCM 大小
+2. 静态分析 SwiftUI 页面（QAsset / QNewAsset Token、QBackground、SoundService 调用、字符串字面量），
+   汇总每个页面用到的资源
+3. 列出占用最大的资源，超出预算的资源和页面标记为错误（返回非零退出码，可用于 CI）
+
+图片按设备倍率（默认 @3x）选取对应文件；音频按 AVAudioPCMBuffer 的 Float32 格式估算。
+
+用法：
+    python3 estimate_memory.py
+    python3 estimate_memory.py --scale 2x --asset-budget 8 --screen-budget 32
+    python3 estimate_memory.py game_background_new.jpg   # 额外估算指定文件
+"""
+
+import os
+import re
+import sys
+import glob
+import argparse
+
+from asset_headers import probe, AUDIO_FORMATS, IMAGE_FORMATS
+from asset_catalog import index_catalog, is_single_scale
+
+# 根目录
+ROOT_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_DIR = os.path.join(ROOT_DIR, "MathaxyAI", "MathaxyAI-iOS", "Mathaxy")
+RESOURCES_DIR = os.path.join(PROJECT_DIR, "Resources")
+ASSETS_DIR = os.path.join(RESOURCES_DIR, "Assets.xcassets")
+SOUNDS_DIR = os.path.join(RESOURCES_DIR, "Sounds")
+MODULES_DIR = os.path.join(PROJECT_DIR, "Modules")
+SOUND_SERVICE_PATH = os.path.join(PROJECT_DIR, "Services", "SoundService.swift")
+
+MB = 1024 * 1024
+DEFAULT_ASSET_BUDGET_MB = 16    # 单个资源解码后的上限
+DEFAULT_SCREEN_BUDGET_MB = 48   # 单个页面所有资源解码后的上限
+PCM_BYTES_PER_SAMPLE = 4        # AVAudioPCMBuffer 标准格式为 Float32
+TOP_COUNT = 15
+
+# Swift 源码解析
+DECLARATION_PATTERN = re.compile(r'\b(?:enum|struct|class)\s+(\w+)[^{]*\{')
+CONSTANT_PATTERN = re.compile(r'static\s+let\s+(\w+)\s*=\s*"([^"]+)"')
+TOKEN_PATTERN = re.compile(r'\b(?:QAsset|QNewAsset|AppResources)(?:\.\w+)+')
+BACKGROUND_PATTERN = re.compile(r'QBackground\(pageType:\s*\.(\w+)')
+SOUND_CALL_PATTERN = re.compile(r'SoundService\.shared\.(\w+)\(')
+LITERAL_PATTERN = re.compile(r'"([^"\\\n]+)"')
+
+def image_memory(info):
+    """图片解码后的位图大小（16 位 PNG 按每通道 2 字节）"""
+    if not info.get('width') or not info.get('height'):
+        return 0
+    bytes_per_pixel = 8 if info.get('bits') == 16 else 4
+    return info['width'] * info['height'] * bytes_per_pixel
+
+def audio_memory(info):
+    """音频解码后的 PCM 大小"""
+    if info.get('placeholder') or not info.get('duration') or not info.get('sample_rate'):
+        return 0
+    return int(info['duration'] * info['sample_rate']) * (info.get('channels') or 1) * PCM_BYTES_PER_SAMPLE
+
+def pick_scale_file(asset_set, scale):
+    """选取设备倍率对应的文件，没有时取可用的最高倍率"""
+    images = [e for e in (asset_set['contents'] or {}).get('images', [])
+              if e.get('filename') in asset_set['files'] and 'size' not in e]
+    if not images:
+        return None
+    if is_single_scale(images):
+        return images[0]['filename']
+    for entry in images:
+        if entry.get('scale') == scale:
+            return entry['filename']
+    return max(images, key=lambda e: e.get('scale', '1x'))['filename']
+
+def collect_assets(scale, extra_paths=()):
+    """统计所有资源，返回 {资源名: {kind, path, bytes, detail}}
+
+    图片资源名为 imageset 名称（含命名空间目录），音频资源名为文件名。
+    """
+    assets = {}
+    if os.path.isdir(ASSETS_DIR):
+        for asset_set in index_catalog(ASSETS_DIR):
+            if asset_set['kind'] != 'imageset':
+                continue
+            filename = pick_scale_file(asset_set, scale)
+            if filename is None:
+                continue
+            info = asset_set['files'][filename]
+            name = os.path.splitext(os.path.relpath(asset_set['path'], ASSETS_DIR))[0]
+            assets[name] = {
+                'kind': 'image',
+                'path': os.path.join(asset_set['path'], filename),
+                'bytes': image_memory(info),
+                'detail': f"{info.get('width')}x{info.get('height')}",
+            }
+
+    paths = sorted(glob.glob(os.path.join(SOUNDS_DIR, "*"))) + list(extra_paths)
+    for path in paths:
+        if not os.path.isfile(path) or path.endswith(('.spec', '.info')):
+            continue
+        info = probe(path)
+        if info['format'] in AUDIO_FORMATS:
+            detail = f"{info.get('duration', 0):.2f}s {info.get('sample_rate')}Hz"
+            assets[os.path.basename(path)] = {'kind': 'audio', 'path': path, 'bytes': audio_memory(info), 'detail': detail}
+        elif info['format'] in IMAGE_FORMATS:
+            assets[os.path.basename(path)] = {'kind': 'image', 'path': path, 'bytes': image_memory(info),
+                                              'detail': f"{info.get('width')}x{info.get('height')}"}
+    return assets
+
+def parse_swift_constants(paths):
+    """解析 enum / struct 中的字符串常量，返回 {"QAsset.bg.home": "home_background_qstyle", ...}"""
+    constants = {}
+    for path in paths:
+        with open(path, 'r', encoding='utf-8', errors='replace') as f:
+            lines = f.read().splitlines()
+        stack = []  # [(类型名, 声明前的大括号深度)]
+        depth = 0
+        for line in lines:
+            code = line.split('//')[0]
+            declaration = DECLARATION_PATTERN.search(code)
+            if declaration:
+                stack.append((declaration.group(1), depth))
+            constant = CONSTANT_PATTERN.search(code)
+            if constant and stack:
+                constants['.'.join([name for name, _ in stack] + [constant.group(1)])] = constant.group(2)
+            depth += code.count('{') - code.count('}')
+            while stack and depth <= stack[-1][1]:
+                stack.pop()
+    return constants
+
+def parse_sound_service(path=SOUND_SERVICE_PATH):
+    """解析 SoundService：方法名 -> 实际播放的文件名候选（Q 版 .m4a 优先，旧命名兜底）"""
+    if not os.path.exists(path):
+        return {}
+    with open(path, 'r', encoding='utf-8', errors='replace') as f:
+        content = f.read()
+    q_names = dict(re.findall(r'"(\w+)":\s*"(q_\w+)"', content))
+    methods = {}
+    for match in re.finditer(r'func\s+(\w+)\([^)]*\)\s*\{(.*?)(?=\n\s*(?:private\s+)?func\s|\Z)', content, re.DOTALL):
+        sound = re.search(r'playSound\(named:\s*"(\w+)",\s*withExtension:\s*"(\w+)"\)', match.group(2))
+        if sound:
+            name, ext = sound.groups()
+            methods[match.group(1)] = [f"{q_names[name]}.m4a"] if name in q_names else []
+            methods[match.group(1)].append(f"{name}.{ext}")
+    return methods
+
+def find_screens(modules_dir=MODULES_DIR):
+    """页面文件：Modules/*/View/*.swift，连同同名 ViewModel，返回 {页面名: [源码路径, ...]}"""
+    screens = {}
+    for path in sorted(glob.glob(os.path.join(modules_dir, "*", "View", "*.swift"))):
+        name = os.path.splitext(os.path.basename(path))[0]
+        sources = [path]
+        view_model = os.path.join(os.path.dirname(os.path.dirname(path)), "ViewModel",
+                                  re.sub(r'View$', '', name) + "ViewModel.swift")
+        if os.path.exists(view_model):
+            sources.append(view_model)
+        screens[name] = sources
+    return screens
+
+def screen_references(sources, constants, sound_methods, assets):
+    """返回页面引用的 (已找到的资源名集合, 未找到的资源名集合)"""
+    names = set()
+    for path in sources:
+        with open(path, 'r', encoding='utf-8', errors='replace') as f:
+            content = f.read()
+        names.update(constants[token] for token in TOKEN_PATTERN.findall(content) if token in constants)
+        names.update(constants.get(f"QAsset.bg.{page}", page) for page in BACKGROUND_PATTERN.findall(content))
+        for method in SOUND_CALL_PATTERN.findall(content):
+            candidates = sound_methods.get(method)
+            if candidates:
+                # 与 SoundService 一致：Q 版存在时播放 Q 版，否则回退旧命名
+                names.add(next((c for c in candidates if c in assets), candidates[0]))
+        names.update(literal for literal in LITERAL_PATTERN.findall(content) if literal in assets)
+
+    found = {name for name in names if name in assets}
+    return found, names - found
+
+def format_size(size):
+    """字节数格式化为 MB"""
+    return f"{size / MB:7.2f} MB"
+
+def main():
+    """主函数"""
+    parser = argparse.ArgumentParser(description="Mathaxy 运行时内存占用估算工具")
+    parser.add_argument('paths', nargs='*', help="额外估算的图片或音频文件")
+    parser.add_argument('--scale', default='3x', choices=['1x', '2x', '3x'], help="设备倍率（默认 3x）")
+    parser.add_argument('--asset-budget', type=float, default=DEFAULT_ASSET_BUDGET_MB, help="单个资源预算（MB）")
+    parser.add_argument('--screen-budget', type=float, default=DEFAULT_SCREEN_BUDGET_MB, help="单个页面预算（MB）")
+    parser.add_argument('--top', type=int, default=TOP_COUNT, help="列出占用最大的资源个数")
+    args = parser.parse_args()
+
+    print("🧠 Mathaxy 运行时内存占用估算工具")
+    print("================================")
+    print()
+
+    assets = collect_assets(args.scale, args.paths)
+    images = [a for a in assets.values() if a['kind'] == 'image']
+    sounds = [a for a in assets.values() if a['kind'] == 'audio']
+    print(f"📦 图片: {len(images)} 个，解码后 {format_size(sum(a['bytes'] for a in images)).strip()}（@{args.scale}）")
+    print(f"🔊 音频: {len(sounds)} 个，解码后 {format_size(sum(a['bytes'] for a in sounds)).strip()}")
+    print()
+
+    print(f"📊 解码后占用最大的 {args.top} 个资源")
+    ranked = sorted(assets.items(), key=lambda item: item[1]['bytes'], reverse=True)
+    for name, asset in ranked[:args.top]:
+        print(f"   {format_size(asset['bytes'])}  {asset['kind']:<5}  {name}（{asset['detail']}）")
+    print()
+
+    swift_files = glob.glob(os.path.join(PROJECT_DIR, "**", "*.swift"), recursive=True)
+    constants = parse_swift_constants(swift_files)
+    sound_methods = parse_sound_service()
+    screen_rows = []
+    for screen, sources in find_screens().items():
+        found, missing = screen_references(sources, constants, sound_methods, assets)
+        screen_rows.append((screen, sum(assets[name]['bytes'] for name in found), found, missing))
+    screen_rows.sort(key=lambda row: row[1], reverse=True)
+    screen_totals = [(screen, total) for screen, total, _, _ in screen_rows]
+
+    print("📱 各页面资源占用")
+    for screen, total, found, missing in screen_rows:
+        note = f"，未找到: {', '.join(sorted(missing))}" if missing else ""
+        print(f"   {format_size(total)}  {screen}（{len(found)} 个资源{note}）")
+    print()
+
+    asset_budget = args.asset_budget * MB
+    screen_budget = args.screen_budget * MB
+    over_assets = [(name, asset) for name, asset in ranked if asset['bytes'] > asset_budget]
+    over_screens = [(screen, total) for screen, total in screen_totals if total > screen_budget]
+    for name, asset in over_assets:
+        print(f"❌ 资源超出预算 {args.asset_budget:g} MB: {name} {format_size(asset['bytes']).strip()}"
+              f"（{os.path.relpath(asset['path'], ROOT_DIR)}）")
+    for screen, total in over_screens:
+        print(f"❌ 页面超出预算 {args.screen_budget:g} MB: {screen} {format_size(total).strip()}")
+
+    print("================================")
+    if over_assets or over_screens:
+        print(f"❌ 超出预算: {len(over_assets)} 个资源，{len(over_screens)} 个页面")
+        return 1
+    print("🎉 所有资源和页面都在预算内！")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
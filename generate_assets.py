@@ -11,19 +11,45 @@ import sys
 import re
 import math
 import wave
+import copy
 import struct
+import subprocess
+import functools
+from array import array
+from concurrent.futures import ProcessPoolExecutor
 
 # 资源输出目录
 base_dir = "/Users/yanzhe/workspace/Mathaxy/MathaxyAI/MathaxyAI-iOS/Mathaxy/Resources"
 new_audio_dir = "/Users/yanzhe/workspace/Mathaxy/audio"
 new_image_dir = "/Users/yanzhe/workspace/Mathaxy/image"
 
-# 创建输出目录
-os.makedirs(os.path.join(base_dir, "Assets.xcassets/panda_character.imageset"), exist_ok=True)
-os.makedirs(os.path.join(base_dir, "Assets.xcassets/rabbit_character.imageset"), exist_ok=True)
-os.makedirs(os.path.join(base_dir, "Sounds"), exist_ok=True)
-os.makedirs(new_audio_dir, exist_ok=True)
-os.makedirs(new_image_dir, exist_ok=True)
+# 流式渲染参数
+SAMPLE_RATE = 44100
+STREAM_BLOCK_SIZE = 4096  # 每块采样数，内存占用与音轨时长无关
+
+# 音符合成参数
+WAVETABLE_SIZE = 2048
+DEFAULT_ADSR = (0.005, 0.25, 0.0, 0.12)  # 起音、衰减、持续电平、释音（秒）
+NOTE_OFFSETS = {'C': 0, 'D': 2, 'E': 4, 'F': 5, 'G': 7, 'A': 9, 'B': 11}
+NOTE_PATTERN = re.compile(r'([A-G])(#|b)?(\d)')
+TIMBRE_ALIASES = {
+    '正弦': 'sine', '正弦波': 'sine',
+    '三角': 'triangle', '三角波': 'triangle',
+    '方波': 'square',
+    '锯齿': 'sawtooth', '锯齿波': 'sawtooth',
+    '柔和': 'soft',
+}
+# 包络描述 -> 秒
+ATTACK_TIMES = {'快速': 0.005, '中等': 0.03, '慢速': 0.12, '缓慢': 0.12}
+DECAY_TIMES = {'快速': 0.08, '中等': 0.25, '长': 0.8}
+
+def create_output_dirs():
+    """创建输出目录"""
+    os.makedirs(os.path.join(base_dir, "Assets.xcassets/panda_character.imageset"), exist_ok=True)
+    os.makedirs(os.path.join(base_dir, "Assets.xcassets/rabbit_character.imageset"), exist_ok=True)
+    os.makedirs(os.path.join(base_dir, "Sounds"), exist_ok=True)
+    os.makedirs(new_audio_dir, exist_ok=True)
+    os.makedirs(new_image_dir, exist_ok=True)
 
 # 扫描所有.spec文件
 def scan_spec_files(root_dir):
@@ -37,7 +63,10 @@ def scan_spec_files(root_dir):
 
 # 解析.spec文件
 def parse_spec_file(spec_path):
-    """解析.spec文件，提取配置信息"""
+    """解析.spec文件，提取配置信息
+    
+    ADSR 或音符写错时打印文件与行号并返回 None，由调用方跳过该文件。
+    """
     config = {}
     
     with open(spec_path, 'r', encoding='utf-8') as f:
@@ -92,68 +121,506 @@ def parse_spec_file(spec_path):
         if bitrate_num:
             config['bitrate'] = int(bitrate_num.group(1))
     
+    # 提取循环标记（背景音乐/环境音）
+    loop_match = re.search(r'- 循环：(.*?)$', content, re.MULTILINE)
+    if loop_match:
+        config['loop'] = loop_match.group(1).strip() in ('是', '循环', 'yes', 'true')
+    
+    # 提取音色、包络
+    timbre = 'sine'
+    timbre_match = re.search(r'- 音色：(.*?)$', content, re.MULTILINE)
+    if timbre_match:
+        timbre = normalize_timbre(timbre_match.group(1).strip())
+    
+    adsr = DEFAULT_ADSR
+    vibrato = 0.0
+    envelope_match = re.search(r'- 包络：(.*?)$', content, re.MULTILINE)
+    if envelope_match:
+        adsr, vibrato = parse_envelope(envelope_match.group(1).strip())
+    adsr_match = re.search(r'- ADSR：(.*?)$', content, re.MULTILINE)
+    if adsr_match:
+        try:
+            adsr = parse_adsr(adsr_match.group(1).strip())
+        except (ValueError, AttributeError) as e:
+            report_spec_error(spec_path, content, adsr_match, e)
+            return None
+    
+    # 提取音符序列：显式的"音符"优先，其次是"音调"描述
+    sequence_match = re.search(r'- 音符：(.*?)$', content, re.MULTILINE)
+    pitch_match = re.search(r'- 音调：(.*?)$', content, re.MULTILINE)
+    try:
+        if sequence_match:
+            config['notes'] = parse_note_sequence(sequence_match.group(1).strip(), adsr, timbre, vibrato)
+            if config['notes']:
+                config['duration'] = max(n['start'] + n['length'] for n in config['notes'])
+        elif pitch_match:
+            config['notes'] = build_note_events(pitch_match.group(1).strip(), config.get('duration', 0.5),
+                                                adsr, timbre, vibrato)
+    except ValueError as e:
+        report_spec_error(spec_path, content, sequence_match or pitch_match, e)
+        return None
+    
     return config
 
-def generate_sound(config):
-    """根据配置生成音效"""
-    # 默认参数
-    sample_rate = 44100
-    duration = config.get('duration', 0.5)
+def report_spec_error(spec_path, content, match, error):
+    """打印 .spec 文件中出错的位置（行号从 1 开始）"""
+    line = content.count('\n', 0, match.start()) + 1
+    print(f"警告: {spec_path} 第 {line} 行无法解析（{error}），跳过该文件")
+
+def note_to_frequency(name):
+    """音名转频率（A4 = 440Hz），如 C5、Eb3、F#4"""
+    match = NOTE_PATTERN.fullmatch(name.strip())
+    if not match:
+        raise ValueError(f"无法识别的音名: {name}")
+    letter, accidental, octave = match.groups()
+    midi = (int(octave) + 1) * 12 + NOTE_OFFSETS[letter]
+    if accidental == '#':
+        midi += 1
+    elif accidental == 'b':
+        midi -= 1
+    return 440.0 * 2 ** ((midi - 69) / 12)
+
+def normalize_timbre(name):
+    """音色名称归一化（支持中文描述）"""
+    name = name.split('（')[0].strip()
+    return TIMBRE_ALIASES.get(name, name.lower() or 'sine')
+
+def parse_envelope(text):
+    """解析包络描述（如"快速起音，中等衰减"），返回 (ADSR, 颤音深度)"""
+    attack, decay, sustain, release = DEFAULT_ADSR
+    attack_match = re.search(r'(快速|中等|慢速|缓慢)起音', text)
+    if attack_match:
+        attack = ATTACK_TIMES[attack_match.group(1)]
+    decay_match = re.search(r'(快速|中等|长)衰减', text)
+    if decay_match:
+        decay = DECAY_TIMES[decay_match.group(1)]
+        release = decay / 2
+    vibrato = 0.006 if '颤音' in text else 0.0
+    return (attack, decay, sustain, release), vibrato
+
+def parse_adsr(text):
+    """解析显式 ADSR，如 "5ms/120ms/0.6/200ms"（电平为 0-1，时间可带 ms/s）"""
+    values = []
+    for i, part in enumerate(text.split('/')[:4]):
+        part = part.strip()
+        number = float(re.search(r'\d+(?:\.\d+)?', part).group(0))
+        if i != 2 and part.endswith('ms'):
+            number /= 1000
+        values.append(number)
+    if len(values) != 4:
+        raise ValueError(f"ADSR 需要 4 个参数: {text}")
+    return tuple(values)
+
+def make_note(frequency, start, length, adsr=DEFAULT_ADSR, timbre='sine', vibrato=0.0):
+    """创建音符事件"""
+    return {
+        'frequency': frequency,
+        'start': start,
+        'length': length,
+        'adsr': adsr,
+        'timbre': timbre,
+        'vibrato': vibrato,
+    }
+
+def build_note_events(text, duration, adsr=DEFAULT_ADSR, timbre='sine', vibrato=0.0):
+    """根据"音调"描述生成音符事件
+    
+    例如 "C5-E5-G5（大三和弦）" 为同时发声的和弦，
+    "C5-E5-G5-C6（上行琶音）" 则在时长内依次发声。
+    """
+    names = [m.group(0) for m in NOTE_PATTERN.finditer(text)]
+    if not names:
+        return []
+    
+    if '和弦' in text and '上行' not in text and '下行' not in text:
+        unique_names = list(dict.fromkeys(names))
+        return [make_note(note_to_frequency(n), 0.0, duration, adsr, timbre, vibrato) for n in unique_names]
+    
+    step = duration / len(names)
+    return [make_note(note_to_frequency(n), i * step, step, adsr, timbre, vibrato) for i, n in enumerate(names)]
+
+def parse_note_sequence(text, adsr=DEFAULT_ADSR, timbre='sine', vibrato=0.0):
+    """解析显式音符序列，如 "C5/0.1 E5/0.1 G5+C6/0.3/triangle R/0.05"
+    
+    每项为 音名[+音名...]/时长[/音色]，R 表示休止。
+    """
+    notes = []
+    time = 0.0
+    for token in text.split():
+        parts = token.split('/')
+        length = float(parts[1]) if len(parts) > 1 else 0.2
+        note_timbre = normalize_timbre(parts[2]) if len(parts) > 2 else timbre
+        if parts[0] != 'R':
+            for name in parts[0].split('+'):
+                notes.append(make_note(note_to_frequency(name), time, length, adsr, note_timbre, vibrato))
+        time += length
+    return notes
+
+def tone_parameters(config):
+    """根据风格返回 (频率列表, 增益, 衰减系数, 颤音深度)"""
     frequency = config.get('frequency', 440)
     volume = config.get('volume', 0.5)
     style = config.get('style', 'normal')
-    filename = config.get('filename', 'sound.mp3')
     
-    # 生成音频数据
-    num_samples = int(sample_rate * duration)
-    samples = []
+    if style == '欢快、积极':
+        # 欢快的和弦音：根音 + 大三度 + 纯五度，快速衰减
+        return [frequency, frequency * 2 ** (4 / 12), frequency * 1.5], volume / 3, 8.0, 0.0
+    elif style == '悲伤、消极':
+        return [frequency], volume, 3.0, 0.0
+    elif style == '紧张、急促':
+        # 5Hz 颤音，不衰减
+        return [frequency], volume, 0.0, 0.1
+    else:
+        return [frequency], volume, 5.0, 0.0
+
+class ToneState:
+    """跨块保持连续的振荡器相位与包络状态"""
     
-    for i in range(num_samples):
-        t = float(i) / sample_rate
+    VIBRATO_RATE = 5.0
+    
+    def __init__(self, config, sample_rate=SAMPLE_RATE, loop_length=None):
+        frequencies, self.gain, decay, self.vibrato_depth = tone_parameters(config)
+        vibrato_rate = self.VIBRATO_RATE
         
-        if style == '欢快、积极':
-            # 生成欢快的和弦音
-            freq1 = frequency
-            freq2 = int(frequency * 1.2599)  # 大三度
-            freq3 = int(frequency * 1.5)  # 纯五度
-            sample = volume * (math.sin(2 * math.pi * freq1 * t) + 
-                              math.sin(2 * math.pi * freq2 * t) + 
-                              math.sin(2 * math.pi * freq3 * t)) / 3
-            # 快速衰减
-            sample *= math.exp(-t * 8)
-        elif style == '悲伤、消极':
-            # 生成悲伤的音效
-            sample = volume * math.sin(2 * math.pi * frequency * t) * math.exp(-t * 3)
-        elif style == '紧张、急促':
-            # 生成紧张的音效
-            freq_variation = frequency * 0.1 * math.sin(2 * math.pi * 5 * t)
-            sample = volume * math.sin(2 * math.pi * (frequency + freq_variation) * t)
-        else:
-            # 默认音效
-            sample = volume * math.sin(2 * math.pi * frequency * t) * math.exp(-t * 5)
+        if loop_length:
+            # 循环音轨：把频率量化为循环长度内的整数周期，并关闭衰减，
+            # 使循环终点的相位与包络恰好回到起点，实现无缝衔接
+            frequencies = [self._quantize(f, loop_length, sample_rate) for f in frequencies]
+            vibrato_rate = self._quantize(vibrato_rate, loop_length, sample_rate)
+            decay = 0.0
         
-        samples.append(sample)
+        self.frequencies = frequencies
+        self.phases = [0.0] * len(frequencies)
+        self.increments = [2 * math.pi * f / sample_rate for f in frequencies]
+        self.vibrato_phase = 0.0
+        self.vibrato_increment = 2 * math.pi * vibrato_rate / sample_rate
+        self.envelope = 1.0
+        self.envelope_step = math.exp(-decay / sample_rate)
+    
+    @staticmethod
+    def _quantize(frequency, loop_length, sample_rate):
+        """将频率调整为 loop_length 个采样内的整数周期"""
+        cycles = max(1, round(frequency * loop_length / sample_rate))
+        return cycles * sample_rate / loop_length
+    
+    def render(self, count):
+        """渲染 count 个采样，返回 16 位整数数组，并推进内部状态"""
+        two_pi = 2 * math.pi
+        gain = self.gain
+        depth = self.vibrato_depth
+        phases = self.phases
+        increments = self.increments
+        envelope = self.envelope
+        envelope_step = self.envelope_step
+        vibrato_phase = self.vibrato_phase
+        vibrato_increment = self.vibrato_increment
+        
+        block = array('h', bytes(2 * count))
+        for i in range(count):
+            value = 0.0
+            for k in range(len(phases)):
+                value += math.sin(phases[k])
+                step = increments[k]
+                if depth:
+                    step *= 1.0 + depth * math.sin(vibrato_phase)
+                phases[k] = (phases[k] + step) % two_pi
+            vibrato_phase = (vibrato_phase + vibrato_increment) % two_pi
+            
+            sample = gain * value * envelope
+            envelope *= envelope_step
+            # 确保样本值在[-1, 1]范围内
+            sample = max(min(sample, 1.0), -1.0)
+            block[i] = int(sample * 32767)
+        
+        self.envelope = envelope
+        self.vibrato_phase = vibrato_phase
+        return block
+
+def harmonic_amplitude(timbre, n):
+    """第 n 次谐波的幅度"""
+    if timbre == 'sine':
+        return 1.0 if n == 1 else 0.0
+    if timbre == 'triangle':
+        return 0.0 if n % 2 == 0 else (-1) ** ((n - 1) // 2) / (n * n)
+    if timbre == 'square':
+        return 0.0 if n % 2 == 0 else 1.0 / n
+    if timbre == 'sawtooth':
+        return (-1) ** (n + 1) / n
+    if timbre == 'soft':
+        # Q版柔和音色：只保留前几次谐波，快速滚降
+        return 1.0 / (n * n) if n <= 4 else 0.0
+    raise ValueError(f"未知音色: {timbre}")
+
+@functools.lru_cache(maxsize=None)
+def band_limited_wavetable(timbre, harmonics):
+    """预计算带限波表（只叠加 harmonics 次以内的谐波），按 (音色, 谐波数) 缓存"""
+    table = array('d', bytes(8 * (WAVETABLE_SIZE + 1)))
+    for n in range(1, harmonics + 1):
+        amplitude = harmonic_amplitude(timbre, n)
+        if not amplitude:
+            continue
+        step = 2 * math.pi * n / WAVETABLE_SIZE
+        for i in range(WAVETABLE_SIZE):
+            table[i] += amplitude * math.sin(step * i)
+    
+    peak = max(abs(v) for v in table) or 1.0
+    for i in range(WAVETABLE_SIZE):
+        table[i] /= peak
+    table[WAVETABLE_SIZE] = table[0]  # 线性插值保护位
+    return table
+
+def wavetable_for(timbre, frequency, sample_rate=SAMPLE_RATE):
+    """按八度分桶取波表，保证该八度内最高音的谐波不超过奈奎斯特频率"""
+    octave_top = 2 ** math.ceil(math.log2(frequency))
+    harmonics = max(1, int(sample_rate / 2 / octave_top))
+    return band_limited_wavetable(timbre, harmonics)
+
+class NoteVoice:
+    """单个音符的发声状态：波表相位 + ADSR 包络"""
+    
+    VIBRATO_RATE = 5.5
+    
+    def __init__(self, note, sample_rate=SAMPLE_RATE):
+        attack, decay, sustain, release = note.get('adsr', DEFAULT_ADSR)
+        self.start = int(note['start'] * sample_rate)
+        self.gate = max(1, int(note['length'] * sample_rate))
+        self.attack = max(1, int(attack * sample_rate))
+        self.decay = max(1, int(decay * sample_rate))
+        self.sustain = sustain
+        self.release = max(1, int(release * sample_rate))
+        self.end = self.start + self.gate + self.release
+        self.release_level = self._held_level(self.gate)
+        
+        frequency = note['frequency']
+        self.table = wavetable_for(note.get('timbre', 'sine'), frequency, sample_rate)
+        self.increment = frequency * WAVETABLE_SIZE / sample_rate
+        self.vibrato = note.get('vibrato', 0.0)
+        self.vibrato_increment = 2 * math.pi * self.VIBRATO_RATE / sample_rate
+        self.vibrato_phase = 0.0
+        self.phase = 0.0
+    
+    def _held_level(self, n):
+        """按键保持期间（起音、衰减、持续）第 n 个采样的包络电平"""
+        if n < self.attack:
+            return n / self.attack
+        n -= self.attack
+        if n < self.decay:
+            return 1.0 - (1.0 - self.sustain) * n / self.decay
+        return self.sustain
+    
+    def level(self, n):
+        """第 n 个采样的包络电平"""
+        if n < self.gate:
+            return self._held_level(n)
+        return self.release_level * max(0.0, 1.0 - (n - self.gate) / self.release)
+    
+    def render_into(self, buffer, block_start, gain):
+        """把本音符落在当前块内的部分叠加到 buffer"""
+        first = max(block_start, self.start)
+        last = min(block_start + len(buffer), self.end)
+        table = self.table
+        phase = self.phase
+        increment = self.increment
+        vibrato = self.vibrato
+        for position in range(first, last):
+            index = int(phase)
+            fraction = phase - index
+            value = table[index] + (table[index + 1] - table[index]) * fraction
+            buffer[position - block_start] += gain * value * self.level(position - self.start)
+            
+            step = increment
+            if vibrato:
+                step *= 1.0 + vibrato * math.sin(self.vibrato_phase)
+                self.vibrato_phase += self.vibrato_increment
+            phase += step
+            if phase >= WAVETABLE_SIZE:
+                phase -= WAVETABLE_SIZE
+        self.phase = phase
+
+def voice_spans(voice, loop_length=None):
+    """音符占用的采样区间；循环音轨中越过终点的部分折回起点"""
+    if not loop_length or voice.end <= loop_length:
+        return [(voice.start, voice.end)]
+    return [(voice.start, loop_length), (0, min(voice.end - loop_length, loop_length))]
+
+def render_loop_tails(voices, loop_length, gain, block_size=STREAM_BLOCK_SIZE):
+    """预渲染越过循环终点的释音尾巴，返回需要叠加到循环开头的采样
+    
+    用音符的副本先推进到循环终点，尾巴的相位与包络与正常渲染的部分连续，
+    循环衔接处不会出现断点。只有跨越终点的音符会多渲染一遍。
+    """
+    overrun = max((v.end for v in voices), default=0) - loop_length
+    if overrun <= 0:
+        return []
+    tails = [0.0] * min(overrun, loop_length)
+    for voice in voices:
+        if voice.end <= loop_length:
+            continue
+        clone = copy.copy(voice)
+        position = clone.start
+        while position < loop_length:
+            count = min(block_size, loop_length - position)
+            clone.render_into([0.0] * count, position, gain)
+            position += count
+        tail = [0.0] * (voice.end - loop_length)
+        clone.render_into(tail, loop_length, gain)
+        for i, value in enumerate(tail):
+            tails[i % len(tails)] += value
+    return tails
+
+def render_note_blocks(config, block_size=STREAM_BLOCK_SIZE, sample_rate=SAMPLE_RATE):
+    """把音符序列按固定块大小流式渲染为 16 位 PCM 字节
     
-    # 转换为16位整数
-    samples_16bit = []
-    for sample in samples:
-        # 确保样本值在[-1, 1]范围内
-        sample = max(min(sample, 1.0), -1.0)
-        # 转换为16位整数
-        sample_16bit = int(sample * 32767)
-        samples_16bit.append(sample_16bit)
+    循环音轨（loop）按 duration 截断，越过终点的释音尾巴折回开头叠加，保证首尾无缝衔接；
+    非循环音效保留最后一个音符的释音尾巴。
+    """
+    voices = sorted((NoteVoice(n, sample_rate) for n in config['notes']), key=lambda v: v.start)
+    volume = config.get('volume', 0.5)
+    num_samples = int(sample_rate * config.get('duration', 0.5))
+    loop_length = num_samples if config.get('loop') else None
+    if loop_length:
+        voices = [v for v in voices if v.start < loop_length]
+    else:
+        num_samples = max([num_samples] + [v.end for v in voices])
+    
+    # 按最大同时发声数归一化，避免叠加后削波
+    spans = [span for v in voices for span in voice_spans(v, loop_length)]
+    edges = sorted([(start, 1) for start, _ in spans] + [(end, -1) for _, end in spans])
+    polyphony = peak = 0
+    for _, delta in edges:
+        polyphony += delta
+        peak = max(peak, polyphony)
+    gain = volume / max(1, peak)
+    tails = render_loop_tails(voices, loop_length, gain, block_size) if loop_length else []
+    
+    active = []
+    pending = 0
+    for block_start in range(0, num_samples, block_size):
+        count = min(block_size, num_samples - block_start)
+        block_end = block_start + count
+        while pending < len(voices) and voices[pending].start < block_end:
+            active.append(voices[pending])
+            pending += 1
+        
+        buffer = [0.0] * count
+        for voice in active:
+            voice.render_into(buffer, block_start, gain)
+        for i in range(block_start, min(block_end, len(tails))):
+            buffer[i - block_start] += tails[i]
+        active = [v for v in active if v.end > block_end]
+        
+        block = array('h', (int(max(min(v, 1.0), -1.0) * 32767) for v in buffer))
+        if sys.byteorder == 'big':
+            block.byteswap()
+        yield block.tobytes()
+
+def render_sound_blocks(config, block_size=STREAM_BLOCK_SIZE, sample_rate=SAMPLE_RATE):
+    """按固定块大小流式生成音频数据（小端 16 位 PCM 字节）
+    
+    只保留当前块，长时间背景音乐的内存占用保持恒定。
+    配置中带有音符序列（notes）时使用波表合成。
+    """
+    if config.get('notes'):
+        yield from render_note_blocks(config, block_size, sample_rate)
+        return
     
-    # 保存为WAV文件（临时）
+    duration = config.get('duration', 0.5)
+    num_samples = int(sample_rate * duration)
+    state = ToneState(config, sample_rate, num_samples if config.get('loop') else None)
+    
+    rendered = 0
+    while rendered < num_samples:
+        count = min(block_size, num_samples - rendered)
+        block = state.render(count)
+        if sys.byteorder == 'big':
+            block.byteswap()
+        yield block.tobytes()
+        rendered += count
+
+class StreamingWavWriter:
+    """边写边落盘的 WAV 写入器，关闭时回填长度并可写入循环点（smpl 块）"""
+    
+    def __init__(self, path, sample_rate=SAMPLE_RATE, loop=False):
+        self.path = path
+        self.sample_rate = sample_rate
+        self.loop = loop  # 为 True 时整段音频作为循环区间
+        self.data_size = 0
+        self.file = open(path, 'wb')
+        self.file.write(b'RIFF\x00\x00\x00\x00WAVE')
+        # fmt 块：PCM、单声道、16 位
+        self.file.write(b'fmt ' + struct.pack('<IHHIIHH', 16, 1, 1, sample_rate, sample_rate * 2, 2, 16))
+        self.file.write(b'data\x00\x00\x00\x00')
+    
+    def write(self, data):
+        self.file.write(data)
+        self.data_size += len(data)
+    
+    def close(self):
+        if self.loop and self.data_size:
+            start, end = 0, self.data_size // 2 - 1
+            self.file.write(b'smpl' + struct.pack('<I', 60))
+            self.file.write(struct.pack('<9I', 0, 0, 1000000000 // self.sample_rate, 60, 0, 0, 0, 1, 0))
+            self.file.write(struct.pack('<6I', 0, 0, start, end, 0, 0))
+        riff_size = self.file.tell() - 8
+        self.file.seek(4)
+        self.file.write(struct.pack('<I', riff_size))
+        self.file.seek(40)
+        self.file.write(struct.pack('<I', self.data_size))
+        self.file.close()
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc):
+        self.close()
+
+class EncoderSink:
+    """通过 ffmpeg 管道边渲染边编码（MP3/M4A 等）"""
+    
+    def __init__(self, path, sample_rate=SAMPLE_RATE):
+        self.path = path
+        self.process = subprocess.Popen(
+            ['ffmpeg', '-y', '-loglevel', 'error',
+             '-f', 's16le', '-ar', str(sample_rate), '-ac', '1', '-i', 'pipe:0', path],
+            stdin=subprocess.PIPE,
+        )
+    
+    def write(self, data):
+        self.process.stdin.write(data)
+    
+    def close(self):
+        self.process.stdin.close()
+        if self.process.wait() != 0:
+            raise RuntimeError(f"ffmpeg 编码失败: {self.path}")
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc):
+        self.close()
+
+def stream_sound(config, output_path, sample_rate=SAMPLE_RATE):
+    """流式渲染音频并写入 WAV 或编码器，返回写入的采样数"""
+    if output_path.lower().endswith('.wav'):
+        sink = StreamingWavWriter(output_path, sample_rate, config.get('loop', False))
+    else:
+        sink = EncoderSink(output_path, sample_rate)
+    
+    num_samples = 0
+    with sink:
+        for block in render_sound_blocks(config, sample_rate=sample_rate):
+            sink.write(block)
+            num_samples += len(block) // 2
+    
+    return num_samples
+
+def generate_sound(config):
+    """根据配置生成音效"""
+    filename = config.get('filename', 'sound.mp3')
+    
+    # 流式保存为WAV文件（临时）
     wav_path = os.path.join(new_audio_dir, filename.replace('.mp3', '.wav'))
-    with wave.open(wav_path, 'w') as wav_file:
-        wav_file.setnchannels(1)  # 单声道
-        wav_file.setsampwidth(2)  # 16位
-        wav_file.setframerate(sample_rate)
-        # 将16位整数列表转换为字节数据
-        wav_data = b''
-        for sample in samples_16bit:
-            wav_data += struct.pack('<h', sample)  # '<h' 表示小端序16位整数
-        wav_file.writeframes(wav_data)
+    stream_sound(config, wav_path)
     
     print(f"生成WAV音效: {wav_path}")
     
@@ -236,15 +703,22 @@ def generate_audio_from_spec_files():
     
     print(f"找到 {len(audio_spec_files)} 个音频相关的.spec文件")
     
-    # 处理每个音频.spec文件
+    # 解析每个音频.spec文件
+    configs = []
     for spec_file in audio_spec_files:
         print(f"\n处理文件: {spec_file}")
         config = parse_spec_file(spec_file)
+        if config is None:
+            continue
         
         if config.get('filename'):
-            generate_sound(config)
+            configs.append(config)
         else:
             print(f"警告: 无法从 {spec_file} 中提取文件名")
+    
+    # 多进程并行渲染（波表在每个进程内缓存复用）
+    with ProcessPoolExecutor() as executor:
+        list(executor.map(generate_sound, configs))
 
 def generate_images_from_spec_files():
     """根据.spec文件批量生成图片资源"""
@@ -266,6 +740,8 @@ def generate_images_from_spec_files():
     for spec_file in image_spec_files:
         print(f"\n处理文件: {spec_file}")
         config = parse_spec_file(spec_file)
+        if config is None:
+            continue
         
         if config.get('filename'):
             # 这里可以添加图片生成逻辑
@@ -277,6 +753,9 @@ def main():
     """主函数"""
     print("生成游戏资源...")
     
+    # 创建输出目录
+    create_output_dirs()
+    
     # 只生成按钮点击音效
     print("\n生成按钮点击音效...")
     generate_button_click_sound()
@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+"""
+音效精灵打包工具：
+把所有短音效的 PCM 依次拼接（中间插入静音保护段），编码为单个音频文件，
+并输出 JSON 偏移索引，App 只需预加载一个缓冲区即可按片段播放。
+
+用法：
+    python3 pack_audio_sprite.py                 # 输出 sfx_sprite.m4a + sfx_sprite.json
+    python3 pack_audio_sprite.py --format wav    # 输出未压缩的 WAV 精灵
+"""
+
+import os
+import sys
+import json
+import glob
+import wave
+import shutil
+import argparse
+import subprocess
+
+from generate_assets import SAMPLE_RATE, StreamingWavWriter, EncoderSink
+
+# 仓库根目录
+ROOT_DIR = os.path.dirname(os.path.abspath(__file__))
+# 音效目录
+SOUNDS_DIR = os.path.join(ROOT_DIR, "MathaxyAI", "MathaxyAI-iOS", "Mathaxy", "Resources", "Sounds")
+
+# 需要打包的经典音效（优先使用渲染好的 WAV）
+CLASSIC_SFX = [
+    "button_click",
+    "correct_answer",
+    "incorrect_answer",
+    "timeout",
+    "badge_earned",
+    "level_complete",
+    "character_unlocked",
+]
+# Q 版音效
+Q_SFX_PATTERN = "q_sfx_*.m4a"
+
+GUARD_SECONDS = 0.05      # 片段之间的静音保护段
+MAX_CLIP_SECONDS = 2.0    # 超过该时长的不算短音效，不打包
+
+def find_sfx_sources(sounds_dir=SOUNDS_DIR):
+    """返回 [(片段名, 源文件路径), ...]"""
+    sources = []
+    for name in CLASSIC_SFX:
+        for ext in ('.wav', '.m4a', '.mp3'):
+            path = os.path.join(sounds_dir, name + ext)
+            if os.path.exists(path):
+                sources.append((name, path))
+                break
+    for path in sorted(glob.glob(os.path.join(sounds_dir, Q_SFX_PATTERN))):
+        sources.append((os.path.splitext(os.path.basename(path))[0], path))
+    return sources
+
+def is_native_wav(path, sample_rate=SAMPLE_RATE):
+    """是否为可直接读取的单声道 16 位 WAV（无需 ffmpeg）"""
+    if not path.lower().endswith('.wav'):
+        return False
+    try:
+        with wave.open(path, 'rb') as wav_file:
+            return (wav_file.getnchannels(), wav_file.getsampwidth(), wav_file.getframerate()) == (1, 2, sample_rate)
+    except (wave.Error, EOFError):
+        return False
+
+def read_pcm(path, sample_rate=SAMPLE_RATE):
+    """解码为单声道 16 位小端 PCM 字节
+
+    格式一致的 WAV 直接读取，其他格式交给 ffmpeg 解码并重采样。
+    """
+    if is_native_wav(path, sample_rate):
+        with wave.open(path, 'rb') as wav_file:
+            return wav_file.readframes(wav_file.getnframes())
+
+    result = subprocess.run(
+        ['ffmpeg', '-loglevel', 'error', '-i', path,
+         '-f', 's16le', '-ac', '1', '-ar', str(sample_rate), 'pipe:1'],
+        stdout=subprocess.PIPE, check=True,
+    )
+    return result.stdout
+
+def pack_sprite(sources, output_path, sample_rate=SAMPLE_RATE):
+    """逐个解码并流式写入精灵文件，返回 ({片段名: {"start", "duration"}}（秒）, 解码失败数)
+
+    开头同样放一段静音，吸收 AAC 编码器的起始延迟。
+    """
+    guard = bytes(2 * int(GUARD_SECONDS * sample_rate))
+    index = {}
+    fail_count = 0
+    position = 0  # 已写入的采样数
+
+    if output_path.lower().endswith('.wav'):
+        sink = StreamingWavWriter(output_path, sample_rate)
+    else:
+        sink = EncoderSink(output_path, sample_rate)
+
+    with sink:
+        sink.write(guard)
+        position += len(guard) // 2
+        for name, path in sources:
+            try:
+                pcm = read_pcm(path, sample_rate)
+            except (subprocess.CalledProcessError, OSError) as e:
+                print(f"❌ 解码失败 {os.path.basename(path)}: {str(e)}")
+                fail_count += 1
+                continue
+
+            frames = len(pcm) // 2
+            if frames == 0:
+                print(f"⚠️  跳过空文件: {os.path.basename(path)}")
+                continue
+            if frames > MAX_CLIP_SECONDS * sample_rate:
+                print(f"⚠️  跳过过长音效: {os.path.basename(path)} ({frames / sample_rate:.2f}s)")
+                continue
+
+            sink.write(pcm[:frames * 2])
+            sink.write(guard)
+            index[name] = {
+                "start": round(position / sample_rate, 6),
+                "duration": round(frames / sample_rate, 6),
+            }
+            print(f"✅ 打包: {name} ({frames / sample_rate:.3f}s)")
+            position += frames + len(guard) // 2
+
+    return index, fail_count
+
+def write_index(index, sprite_path, index_path, sample_rate=SAMPLE_RATE):
+    """写入 JSON 偏移索引"""
+    data = {
+        "file": os.path.basename(sprite_path),
+        "sample_rate": sample_rate,
+        "sprites": index,
+    }
+    with open(index_path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False, indent=2)
+
+def main():
+    """主函数"""
+    parser = argparse.ArgumentParser(description="Mathaxy 音效精灵打包工具")
+    parser.add_argument('--format', choices=['m4a', 'wav'], default='m4a', help="精灵文件格式")
+    parser.add_argument('--output-dir', default=SOUNDS_DIR, help="输出目录")
+    args = parser.parse_args()
+
+    print("🎵 Mathaxy 音效精灵打包工具")
+    print("=========================")
+    print()
+
+    if not os.path.exists(SOUNDS_DIR):
+        print(f"❌ 目录不存在: {SOUNDS_DIR}")
+        sys.exit(1)
+
+    sources = find_sfx_sources()
+    if not sources:
+        print("❌ 未找到需要打包的音效")
+        sys.exit(1)
+
+    # 检查依赖：M4A 编码和非 WAV 音效的解码都需要 ffmpeg
+    needs_ffmpeg = args.format != 'wav' or not all(is_native_wav(path) for _, path in sources)
+    if needs_ffmpeg and shutil.which('ffmpeg') is None:
+        print("⚠️  缺少 ffmpeg")
+        print("请安装: brew install ffmpeg（或使用 --format wav 并提供 WAV 音效）")
+        sys.exit(1)
+
+    print(f"📝 待打包音效: {len(sources)} 个")
+    print()
+
+    sprite_path = os.path.join(args.output_dir, f"sfx_sprite.{args.format}")
+    index_path = os.path.join(args.output_dir, "sfx_sprite.json")
+    index, fail_count = pack_sprite(sources, sprite_path)
+    write_index(index, sprite_path, index_path)
+
+    print()
+    print("=========================")
+    print("🎉 音效精灵打包完成！")
+    print(f"✅ 片段: {len(index)} 个")
+    print(f"❌ 解码失败: {fail_count} 个")
+    print(f"📁 精灵文件: {sprite_path}")
+    print(f"📁 偏移索引: {index_path}")
+    return 1 if fail_count else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,246 @@
+#!/usr/bin/env python3
+"""
+"Mathaxy 加法大师" 奖状批量渲染工具：
+1. 静态图层（星系背景 + 熊猫 + 兔子）每个进程只合成一次
+2. 每种语言的标题与标签图层在静态图层上合成一次并缓存
+3. 每张奖状只绘制昵称、总用时、勋章数等可变文字
+4. 多进程并行渲染，用于预渲染本地化模板和 QA 预览
+
+用法：
+    python3 render_certificates.py --templates          # 7 种语言的空白模板
+    python3 render_certificates.py --preview            # 各语言 × 各种长度昵称的 QA 预览
+    python3 render_certificates.py --input records.json # 按记录批量渲染
+"""
+
+import os
+import re
+import sys
+import json
+import argparse
+import functools
+from concurrent.futures import ProcessPoolExecutor
+from PIL import Image, ImageDraw, ImageFont
+
+# 根目录
+ROOT_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_DIR = os.path.join(ROOT_DIR, "MathaxyAI", "MathaxyAI-iOS", "Mathaxy")
+ASSETS_DIR = os.path.join(PROJECT_DIR, "Resources", "Assets.xcassets")
+LOCALIZATION_DIR = os.path.join(PROJECT_DIR, "Localization")
+# 输出目录
+OUTPUT_DIR = os.path.join(ROOT_DIR, "certificates")
+
+# 图层素材
+BACKGROUND_PATH = os.path.join(ROOT_DIR, "game_background_new.jpg")
+PANDA_PATH = os.path.join(ASSETS_DIR, "panda_character.imageset", "panda_character@3x.png")
+RABBIT_PATH = os.path.join(ASSETS_DIR, "rabbit_character.imageset", "rabbit_character@3x.png")
+
+# 支持的语言
+LANGUAGES = ["zh-Hans", "zh-Hant", "en", "ja", "ko", "es", "pt"]
+
+# 奖状尺寸（A4 横向比例）
+CERTIFICATE_SIZE = (1600, 1131)
+CHARACTER_HEIGHT = 380
+TEXT_COLOR = (255, 255, 255, 255)
+VALUE_COLOR = (255, 214, 102, 255)
+TEXT_MAX_WIDTH = 900
+# PNG 压缩级别：星系背景压缩率很低，高级别只会显著拖慢编码
+# （QA 预览输出为 JPEG，编码更快、体积更小）
+PNG_COMPRESS_LEVEL = 1
+
+# 可用的 CJK 字体（按顺序尝试）
+FONT_CANDIDATES = [
+    "/System/Library/Fonts/PingFang.ttc",
+    "/System/Library/Fonts/Hiragino Sans GB.ttc",
+    "/System/Library/Fonts/AppleSDGothicNeo.ttc",
+    "/usr/share/fonts/opentype/noto/NotoSansCJK-Regular.ttc",
+    "/usr/share/fonts/noto-cjk/NotoSansCJK-Regular.ttc",
+]
+
+# QA 预览用昵称（覆盖不同长度与文字）
+PREVIEW_NICKNAMES = ["小", "小明", "Ann", "熊猫爱数学", "Alexander", "さくらちゃん", "김민준",
+                     "María Fernanda", "数学银河系最强小队长", "Maximilian-Alexander Fernandes"]
+
+def load_strings(language):
+    """读取 Localizable.strings 中的奖状文案"""
+    path = os.path.join(LOCALIZATION_DIR, f"{language}.lproj", "Localizable.strings")
+    strings = {}
+    with open(path, 'r', encoding='utf-8') as f:
+        for match in re.finditer(r'^"(certificate_[a-z]+)"\s*=\s*"(.*)";', f.read(), re.MULTILINE):
+            strings[match.group(1)] = match.group(2)
+    return strings
+
+@functools.lru_cache(maxsize=None)
+def font_path():
+    """查找可用的 CJK 字体"""
+    for path in FONT_CANDIDATES:
+        if os.path.exists(path):
+            return path
+    return None
+
+@functools.lru_cache(maxsize=None)
+def load_font(size):
+    """按字号缓存字体对象"""
+    path = font_path()
+    if path is None:
+        return ImageFont.load_default(size)
+    return ImageFont.truetype(path, size)
+
+def fit_font(draw, text, size, max_width=TEXT_MAX_WIDTH, min_size=24):
+    """从 size 开始逐步缩小字号，直到文字宽度不超过 max_width"""
+    while size > min_size and draw.textlength(text, font=load_font(size)) > max_width:
+        size -= 4
+    return load_font(size)
+
+def draw_centered(draw, text, y, font, fill):
+    """水平居中绘制文字"""
+    width = draw.textlength(text, font=font)
+    draw.text(((CERTIFICATE_SIZE[0] - width) / 2, y), text, font=font, fill=fill)
+
+def load_character(path):
+    """读取角色图并按 CHARACTER_HEIGHT 等比缩放"""
+    with Image.open(path) as img:
+        img = img.convert("RGBA")
+        width = round(img.width * CHARACTER_HEIGHT / img.height)
+        return img.resize((width, CHARACTER_HEIGHT), Image.Resampling.LANCZOS)
+
+@functools.lru_cache(maxsize=None)
+def static_layer():
+    """静态图层：星系背景 + 熊猫 + 兔子（每个进程只合成一次）"""
+    width, height = CERTIFICATE_SIZE
+    with Image.open(BACKGROUND_PATH) as background:
+        background = background.convert("RGBA")
+        # 等比缩放后居中裁剪铺满
+        scale = max(width / background.width, height / background.height)
+        size = (round(background.width * scale), round(background.height * scale))
+        background = background.resize(size, Image.Resampling.LANCZOS)
+        left = (size[0] - width) // 2
+        top = (size[1] - height) // 2
+        layer = background.crop((left, top, left + width, top + height))
+
+    # 半透明底板，保证文字可读
+    panel = Image.new("RGBA", CERTIFICATE_SIZE, (0, 0, 0, 0))
+    ImageDraw.Draw(panel).rounded_rectangle((120, 90, width - 120, height - 90), radius=48,
+                                            fill=(20, 16, 60, 150), outline=(255, 214, 102, 255), width=6)
+    layer = Image.alpha_composite(layer, panel)
+
+    panda = load_character(PANDA_PATH)
+    rabbit = load_character(RABBIT_PATH)
+    layer.alpha_composite(panda, (60, height - CHARACTER_HEIGHT - 40))
+    layer.alpha_composite(rabbit, (width - rabbit.width - 60, height - CHARACTER_HEIGHT - 40))
+    return layer
+
+@functools.lru_cache(maxsize=None)
+def template_layer(language):
+    """本地化模板：静态图层 + 标题与标签（按语言缓存）"""
+    strings = load_strings(language)
+    layer = static_layer().copy()
+    draw = ImageDraw.Draw(layer)
+    title = strings.get("certificate_title", "Mathaxy")
+    draw_centered(draw, title, 150, fit_font(draw, title, 96), VALUE_COLOR)
+    draw_centered(draw, strings.get("certificate_nickname", ""), 330, load_font(44), TEXT_COLOR)
+    draw_centered(draw, strings.get("certificate_time", ""), 560, load_font(40), TEXT_COLOR)
+    draw_centered(draw, strings.get("certificate_badges", ""), 720, load_font(40), TEXT_COLOR)
+    return layer
+
+def format_time(seconds):
+    """总用时格式化为 分:秒"""
+    seconds = int(round(seconds))
+    return f"{seconds // 60:02d}:{seconds % 60:02d}"
+
+def render_certificate(record):
+    """渲染单张奖状，只绘制可变文字层，返回输出路径"""
+    image = template_layer(record["language"]).copy()
+    draw = ImageDraw.Draw(image)
+    nickname = record.get("nickname", "")
+    if nickname:
+        draw_centered(draw, nickname, 400, fit_font(draw, nickname, 88), VALUE_COLOR)
+    if "total_time" in record:
+        draw_centered(draw, format_time(record["total_time"]), 620, load_font(64), VALUE_COLOR)
+    if "badges" in record:
+        draw_centered(draw, str(record["badges"]), 780, load_font(64), VALUE_COLOR)
+    if record["output"].lower().endswith(('.jpg', '.jpeg')):
+        image.convert("RGB").save(record["output"], "JPEG", quality=90)
+    else:
+        image.convert("RGB").save(record["output"], "PNG", compress_level=PNG_COMPRESS_LEVEL)
+    return record["output"]
+
+def render_safely(record):
+    """渲染单张奖状，返回错误信息（成功时为 None）"""
+    try:
+        render_certificate(record)
+        return None
+    except Exception as e:
+        return str(e)
+
+def build_records(args, output_dir):
+    """根据命令行参数生成渲染记录"""
+    records = []
+    if args.templates:
+        for language in LANGUAGES:
+            records.append({"language": language, "output": os.path.join(output_dir, f"template_{language}.png")})
+    if args.preview:
+        for language in LANGUAGES:
+            for i, nickname in enumerate(PREVIEW_NICKNAMES):
+                records.append({
+                    "language": language,
+                    "nickname": nickname,
+                    "total_time": 1234,
+                    "badges": 8,
+                    "output": os.path.join(output_dir, f"preview_{language}_{i:02d}.jpg"),
+                })
+    if args.input:
+        with open(args.input, 'r', encoding='utf-8') as f:
+            for i, record in enumerate(json.load(f)):
+                record.setdefault("output", os.path.join(output_dir, f"certificate_{record['language']}_{i:04d}.png"))
+                records.append(record)
+    return records
+
+def main():
+    """主函数"""
+    parser = argparse.ArgumentParser(description="Mathaxy 奖状批量渲染工具")
+    parser.add_argument('--templates', action='store_true', help="渲染 7 种语言的空白模板")
+    parser.add_argument('--preview', action='store_true', help="渲染 QA 预览（各语言 × 各长度昵称）")
+    parser.add_argument('--input', help="JSON 记录文件：[{language, nickname, total_time, badges}, ...]")
+    parser.add_argument('--output-dir', default=OUTPUT_DIR, help="输出目录")
+    args = parser.parse_args()
+
+    print("🏆 Mathaxy 奖状渲染工具")
+    print("=====================")
+    print()
+
+    for path in (BACKGROUND_PATH, PANDA_PATH, RABBIT_PATH):
+        if not os.path.exists(path):
+            print(f"❌ 素材文件不存在: {path}")
+            sys.exit(1)
+    if font_path() is None:
+        print("⚠️  未找到 CJK 字体，将使用 Pillow 默认字体（中日韩文字无法显示）")
+
+    records = build_records(args, args.output_dir)
+    if not records:
+        parser.print_help()
+        return 1
+
+    os.makedirs(args.output_dir, exist_ok=True)
+    print(f"📁 输出目录: {args.output_dir}")
+    print(f"📝 预计生成: {len(records)} 张奖状")
+    print()
+
+    # 每个工作进程各自缓存静态图层、语言模板和字体
+    success_count = 0
+    fail_count = 0
+    with ProcessPoolExecutor() as executor:
+        for record, error in zip(records, executor.map(render_safely, records, chunksize=16)):
+            if error is None:
+                success_count += 1
+            else:
+                print(f"❌ 生成失败 {os.path.basename(record['output'])}: {error}")
+                fail_count += 1
+
+    print("=====================")
+    print("🎉 奖状渲染完成！")
+    print(f"✅ 成功: {success_count} 个")
+    print(f"❌ 失败: {fail_count} 个")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,277 @@
+#!/usr/bin/env python3
+"""
+Q 版音效频谱整形工具：
+1. 从 .spec 的"频段建议"解析目标频段（强化 150-600 Hz、少量 1-2 kHz、避免 3-6 kHz 过强、<80 Hz 收敛）
+2. 所有片段补零到同一长度后一次性 FFT，用频段掩码矩阵批量计算各频段能量占比
+3. 按偏差计算每个频段的校正增益（平滑过渡的零相位 EQ），在频域批量应用后逆变换
+4. 输出校正前后的频段能量报告，--apply 时原子替换原文件
+
+用法：
+    python3 shape_sfx_spectrum.py                    # 只分析 Sounds 目录下带频段要求的音效
+    python3 shape_sfx_spectrum.py --apply            # 分析并写回校正后的音效
+    python3 shape_sfx_spectrum.py out/correct.wav    # 指定文件（无 .spec 时使用 Q 版默认频段）
+"""
+
+import os
+import re
+import sys
+import glob
+import fnmatch
+import argparse
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from generate_assets import SAMPLE_RATE, StreamingWavWriter, EncoderSink
+from pack_audio_sprite import SOUNDS_DIR, Q_SFX_PATTERN, read_pcm
+
+# 频段关键词 -> 目标能量占比范围（dB，相对整段总能量）
+BAND_TARGETS = {
+    '强化': (-4.0, 0.0),        # 柔和主体，应占大部分能量
+    '少量': (-18.0, -8.0),      # 存在感，不多不少
+    '避免': (-120.0, -20.0),    # 易刺耳的频段，只设上限
+    '收敛': (-120.0, -24.0),    # 低频隆隆声，只设上限
+}
+# Q 版音效 .spec 中的默认频段（q_sfx_* 或指定文件没有 .spec 时使用）
+DEFAULT_BANDS = [
+    (150.0, 600.0, '强化'),
+    (1000.0, 2000.0, '少量'),
+    (3000.0, 6000.0, '避免'),
+    (0.0, 80.0, '收敛'),
+]
+BAND_PATTERN = re.compile(r'^\s*\*\s*(.*?)$', re.MULTILINE)
+RANGE_PATTERN = re.compile(r'(<\s*)?(\d+(?:\.\d+)?)(?:\s*-\s*(\d+(?:\.\d+)?))?\s*(k?)Hz')
+
+MAX_CORRECTION_DB = 12.0    # 单个频段的最大校正量
+TARGET_MARGIN_DB = 1.0      # 校正到目标范围内侧，留一点余量
+CORRECTION_PASSES = 4       # 频段之间通过总能量相互影响，迭代几次收敛
+EDGE_OCTAVES = 1.0 / 3      # EQ 频段边缘的过渡宽度
+TARGET_PEAK_DB = -1.0       # 校正后峰值不超过 -1 dBFS（见 .spec 峰值要求）
+
+def parse_band_requirements(spec_path):
+    """从 .spec 的"频段建议"解析 [(下限 Hz, 上限 Hz, 关键词), ...]"""
+    with open(spec_path, 'r', encoding='utf-8', errors='replace') as f:
+        content = f.read()
+    if '频段' not in content:
+        return []
+
+    bands = []
+    for line in BAND_PATTERN.findall(content[content.index('频段'):]):
+        keyword = next((k for k in BAND_TARGETS if k in line), None)
+        match = RANGE_PATTERN.search(line)
+        if keyword is None or match is None:
+            continue
+        scale = 1000.0 if match.group(4) else 1.0
+        if match.group(1) or match.group(3) is None:
+            low, high = 0.0, float(match.group(2)) * scale
+        else:
+            low, high = float(match.group(2)) * scale, float(match.group(3)) * scale
+        bands.append((low, high, keyword))
+    return bands
+
+def bands_for(path):
+    """音频文件的目标频段：优先读取同名 .spec，Q 版音效没有 .spec 时使用默认频段"""
+    spec_path = path + '.spec'
+    bands = parse_band_requirements(spec_path) if os.path.exists(spec_path) else []
+    if not bands and fnmatch.fnmatch(os.path.basename(path), Q_SFX_PATTERN):
+        bands = DEFAULT_BANDS
+    return bands
+
+def find_shaping_targets(sounds_dir=SOUNDS_DIR):
+    """查找有频段要求的音效，返回 [(路径, 频段列表), ...]"""
+    paths = set(glob.glob(os.path.join(sounds_dir, Q_SFX_PATTERN)))
+    paths.update(spec[:-len('.spec')] for spec in glob.glob(os.path.join(sounds_dir, "*.spec")))
+    targets = []
+    for path in sorted(paths):
+        bands = bands_for(path)
+        if bands and os.path.exists(path):
+            targets.append((path, bands))
+    return targets
+
+def band_masks(bands, frequencies):
+    """返回 (测量用的矩形掩码, EQ 用的平滑掩码)，形状均为 (频段数, 频点数)"""
+    log_f = np.log2(np.maximum(frequencies, 1.0))
+    hard = np.zeros((len(bands), len(frequencies)))
+    smooth = np.zeros_like(hard)
+    for i, (low, high, _) in enumerate(bands):
+        hard[i] = (frequencies >= low) & (frequencies < high)
+        rise = np.ones_like(log_f) if low <= 0 else np.clip((log_f - np.log2(low)) / EDGE_OCTAVES + 0.5, 0.0, 1.0)
+        fall = np.clip((np.log2(high) - log_f) / EDGE_OCTAVES + 0.5, 0.0, 1.0)
+        # 升余弦过渡
+        smooth[i] = (0.5 - 0.5 * np.cos(np.pi * rise)) * (0.5 - 0.5 * np.cos(np.pi * fall))
+    return hard, smooth
+
+def band_levels(power, hard_masks):
+    """各频段能量占总能量的比例（dB），形状 (片段数, 频段数)"""
+    energy = power @ hard_masks.T
+    total = np.maximum(power.sum(axis=1, keepdims=True), 1e-20)
+    return 10.0 * np.log10(np.maximum(energy / total, 1e-12))
+
+def shape_batch(clips, bands_per_clip, sample_rate=SAMPLE_RATE):
+    """批量频谱整形
+
+    clips 为 float 数组列表；bands_per_clip 为每个片段的频段列表。
+    返回 (整形后的片段列表, 报告)，报告为每个片段的
+    [(频段, 校正前 dB, 校正后 dB, 增益 dB, 目标范围), ...]。
+    """
+    # 所有片段的频段合并成一张表，片段不要求的频段目标为 NaN
+    bands = sorted({band for clip_bands in bands_per_clip for band in clip_bands})
+    low_target = np.full((len(clips), len(bands)), np.nan)
+    high_target = np.full_like(low_target, np.nan)
+    for i, clip_bands in enumerate(bands_per_clip):
+        for band in clip_bands:
+            j = bands.index(band)
+            low_target[i, j], high_target[i, j] = BAND_TARGETS[band[2]]
+
+    # 补零到至少两倍长度，零相位 EQ 的循环卷积尾巴落在补零区，截掉即可
+    lengths = [len(clip) for clip in clips]
+    n_fft = 1 << int(np.ceil(np.log2(max(2 * max(lengths), 2))))
+    batch = np.zeros((len(clips), n_fft))
+    for i, clip in enumerate(clips):
+        batch[i, :len(clip)] = clip
+    spectrum = np.fft.rfft(batch, axis=1)
+    power = np.abs(spectrum) ** 2
+    hard, smooth = band_masks(bands, np.fft.rfftfreq(n_fft, 1.0 / sample_rate))
+
+    before = band_levels(power, hard)
+    gains_db = np.zeros_like(before)
+    for _ in range(CORRECTION_PASSES):
+        gain = 10.0 ** ((gains_db @ smooth) / 20.0)
+        levels = band_levels(power * gain ** 2, hard)
+        # 低于下限则提升、高于上限则衰减，目标范围内不动
+        # 比下限低太多的频段基本没有内容，提升只会放大噪声，留给报告
+        boost = (levels < low_target) & (before >= low_target - 2 * MAX_CORRECTION_DB)
+        step = np.where(boost, low_target + TARGET_MARGIN_DB - levels, 0.0)
+        step = np.where(levels > high_target, high_target - TARGET_MARGIN_DB - levels, step)
+        gains_db = np.clip(gains_db + np.nan_to_num(step), -MAX_CORRECTION_DB, MAX_CORRECTION_DB)
+
+    gain = 10.0 ** ((gains_db @ smooth) / 20.0)
+    after = band_levels(power * gain ** 2, hard)
+    shaped = np.fft.irfft(spectrum * gain, n=n_fft, axis=1)
+
+    results = []
+    report = []
+    peak_limit = 10.0 ** (TARGET_PEAK_DB / 20.0)
+    for i, clip in enumerate(clips):
+        out = shaped[i, :lengths[i]]
+        # 保持原有峰值（不超过 -1 dBFS）
+        peak = float(np.max(np.abs(out))) if out.size else 0.0
+        if peak > 0.0:
+            out = out * (min(float(np.max(np.abs(clip))), peak_limit) / peak)
+        results.append(out)
+        report.append([(bands[j], before[i, j], after[i, j], gains_db[i, j], BAND_TARGETS[bands[j][2]])
+                       for j in range(len(bands)) if bands[j] in bands_per_clip[i]])
+    return results, report
+
+def load_clip(path):
+    """解码为单声道 float（-1..1）"""
+    return np.frombuffer(read_pcm(path), dtype='<i2').astype(np.float64) / 32768.0
+
+def write_clip(samples, path, sample_rate=SAMPLE_RATE):
+    """编码并原子替换原文件"""
+    ext = os.path.splitext(path)[1].lower()
+    fd, tmp_path = tempfile.mkstemp(suffix=ext, dir=os.path.dirname(os.path.abspath(path)))
+    os.close(fd)
+    pcm = (np.clip(samples, -1.0, 1.0) * 32767.0).round().astype('<i2').tobytes()
+    try:
+        sink = StreamingWavWriter(tmp_path, sample_rate) if ext == '.wav' else EncoderSink(tmp_path, sample_rate)
+        with sink:
+            sink.write(pcm)
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+def format_band(band):
+    """频段显示名"""
+    low, high, keyword = band
+    if low <= 0:
+        return f"<{high:g} Hz ({keyword})"
+    return f"{low:g}-{high:g} Hz ({keyword})"
+
+def main():
+    """主函数"""
+    parser = argparse.ArgumentParser(description="Mathaxy Q 版音效频谱整形工具")
+    parser.add_argument('paths', nargs='*', help="要处理的音频文件（默认处理 Sounds 目录下带频段要求的音效）")
+    parser.add_argument('--apply', action='store_true', help="写回校正后的音频（默认只分析）")
+    args = parser.parse_args()
+
+    print("🎚  Mathaxy Q 版音效频谱整形工具")
+    print("==============================")
+    print()
+
+    if np is None:
+        print("⚠️  缺少依赖库 numpy")
+        print("请运行: pip3 install numpy")
+        sys.exit(1)
+
+    if args.paths:
+        targets = [(path, bands_for(path) or DEFAULT_BANDS) for path in args.paths]
+    else:
+        targets = find_shaping_targets()
+    if not targets:
+        print("没有找到带频段要求的音效")
+        return 0
+
+    # 解码由 ffmpeg 子进程完成，用线程池并行
+    def load_safely(path):
+        try:
+            return load_clip(path), None
+        except Exception as e:
+            return None, str(e)
+
+    with ThreadPoolExecutor() as executor:
+        loaded = list(executor.map(load_safely, [path for path, _ in targets]))
+
+    paths, clips, bands_per_clip = [], [], []
+    fail_count = 0
+    for (path, bands), (clip, error) in zip(targets, loaded):
+        if error is not None:
+            print(f"❌ 解码失败 {os.path.basename(path)}: {error}")
+            fail_count += 1
+        elif not clip.size or not np.any(clip):
+            print(f"⚠️  跳过静音或空文件: {os.path.basename(path)}")
+        else:
+            paths.append(path)
+            clips.append(clip)
+            bands_per_clip.append(bands)
+    if not clips:
+        return 1 if fail_count else 0
+
+    print(f"📝 分析 {len(clips)} 个音效")
+    print()
+    shaped, report = shape_batch(clips, bands_per_clip)
+
+    deviation_count = 0
+    for path, rows in zip(paths, report):
+        print(f"🔊 {os.path.basename(path)}")
+        for band, before, after, gain_db, (low, high) in rows:
+            ok = low - 0.05 <= after <= high + 0.05
+            deviation_count += not ok
+            target = f"≤ {high:g}" if low <= -120 else f"{low:g}..{high:g}"
+            print(f"   {'✅' if ok else '❌'} {format_band(band):<22} {before:7.1f} dB → {after:7.1f} dB"
+                  f"（目标 {target} dB，EQ {gain_db:+.1f} dB）")
+
+    if args.apply:
+        print()
+        for path, samples in zip(paths, shaped):
+            try:
+                write_clip(samples, path)
+                print(f"✅ 已写回: {os.path.basename(path)}")
+            except Exception as e:
+                print(f"❌ 写回失败 {os.path.basename(path)}: {str(e)}")
+                fail_count += 1
+
+    print()
+    print("==============================")
+    print(f"⚠️  校正后仍超出目标的频段: {deviation_count} 个")
+    if not args.apply:
+        print("提示: 使用 --apply 写回校正后的音频")
+    return 1 if fail_count else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
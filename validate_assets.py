@@ -0,0 +1,227 @@
+#!/usr/bin/env python3
+"""
+资源校验工具（发布前检查）：
+1. 只读取文件头，提取格式、采样率、声道、时长和图片尺寸
+2. 音效按同名 .spec 文件的要求校验，图片按 Contents.json 校验
+3. 标记占位文件（如只有 12 字节 ID3 头的 MP3）和扩展名与实际格式不符的文件
+4. 线程池并行检查，发现错误时返回非零退出码，可用于 CI
+
+用法：
+    python3 validate_assets.py
+"""
+
+import os
+import re
+import sys
+import json
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+
+from asset_headers import probe, AUDIO_FORMATS, IMAGE_FORMATS
+
+# 仓库根目录
+ROOT_DIR = os.path.dirname(os.path.abspath(__file__))
+RESOURCES_DIR = os.path.join(ROOT_DIR, "MathaxyAI", "MathaxyAI-iOS", "Mathaxy", "Resources")
+SOUNDS_DIR = os.path.join(RESOURCES_DIR, "Sounds")
+ASSETS_DIR = os.path.join(RESOURCES_DIR, "Assets.xcassets")
+
+# 扩展名 -> 实际格式
+EXTENSION_FORMATS = {
+    '.mp3': 'mp3',
+    '.m4a': 'm4a',
+    '.wav': 'wav',
+    '.png': 'png',
+    '.jpg': 'jpeg',
+    '.jpeg': 'jpeg',
+}
+DURATION_TOLERANCE = 0.05  # 秒
+
+def parse_audio_requirements(spec_path):
+    """从音效 .spec 文件中解析格式、时长范围、采样率和声道要求
+
+    兼容 "- 时长：0.5-1秒" 和 "- 采样率: 44.1kHz 或 48kHz" 两种写法。
+    """
+    with open(spec_path, 'r', encoding='utf-8', errors='replace') as f:
+        content = f.read()
+
+    def field(*names):
+        match = re.search(r'^- (?:%s)[：:]\s*(.*?)$' % '|'.join(names), content, re.MULTILINE)
+        return match.group(1).strip() if match else None
+
+    requirements = {}
+
+    format_str = field('格式')
+    if format_str:
+        format_name = format_str.split()[0].lower()
+        requirements['format'] = EXTENSION_FORMATS.get('.' + format_name, format_name)
+
+    duration_str = field('时长')
+    if duration_str:
+        numbers = [float(n) for n in re.findall(r'\d+(?:\.\d+)?', duration_str)]
+        if len(numbers) >= 2:
+            requirements['duration'] = (numbers[0], numbers[1])
+        elif numbers:
+            requirements['duration'] = (numbers[0], numbers[0])
+
+    rate_str = field('采样率', '频率')
+    if rate_str and 'kHz' in rate_str:
+        requirements['sample_rates'] = {int(float(n) * 1000) for n in re.findall(r'(\d+(?:\.\d+)?)\s*kHz', rate_str)}
+
+    channel_str = field('声道')
+    if channel_str:
+        if 'mono' in channel_str.lower() or '单声道' in channel_str:
+            requirements['channels'] = 1
+        elif 'stereo' in channel_str.lower() or '立体声' in channel_str:
+            requirements['channels'] = 2
+
+    return requirements
+
+def check_file_format(path, info):
+    """检查文件能否识别、是否损坏或为占位文件、扩展名是否与实际格式一致"""
+    issues = []
+    expected = EXTENSION_FORMATS.get(os.path.splitext(path)[1].lower())
+    if info['format'] is None:
+        issues.append(('error', path, "无法识别的文件格式"))
+    elif info.get('corrupt'):
+        issues.append(('error', path, f"文件已损坏或被截断（{info['size']} 字节）"))
+    elif info.get('placeholder'):
+        issues.append(('error', path, f"占位文件（{info['size']} 字节，没有实际内容）"))
+    elif expected and info['format'] != expected:
+        issues.append(('error', path, f"扩展名为 {expected}，实际格式为 {info['format']}"))
+    return issues
+
+def check_audio(path, spec_path=None):
+    """校验单个音频文件（有 .spec 时按其要求校验）"""
+    if not os.path.exists(path):
+        return [('error', path, f"缺少 {os.path.basename(spec_path)} 要求的文件")]
+
+    info = probe(path)
+    issues = check_file_format(path, info)
+    if issues or not spec_path:
+        return issues
+
+    requirements = parse_audio_requirements(spec_path)
+    if 'format' in requirements and info['format'] != requirements['format']:
+        issues.append(('error', path, f"格式应为 {requirements['format']}，实际为 {info['format']}"))
+    if 'sample_rates' in requirements and info.get('sample_rate') not in requirements['sample_rates']:
+        expected = '/'.join(str(r) for r in sorted(requirements['sample_rates']))
+        issues.append(('error', path, f"采样率应为 {expected}Hz，实际为 {info.get('sample_rate')}Hz"))
+    if 'channels' in requirements and info.get('channels') != requirements['channels']:
+        issues.append(('warning', path, f"声道数应为 {requirements['channels']}，实际为 {info.get('channels')}"))
+    if 'duration' in requirements and info.get('duration') is not None:
+        low, high = requirements['duration']
+        if not low - DURATION_TOLERANCE <= info['duration'] <= high + DURATION_TOLERANCE:
+            issues.append(('error', path, f"时长应为 {low}-{high}s，实际为 {info['duration']:.2f}s"))
+    return issues
+
+def check_image_set(set_dir):
+    """按 Contents.json 校验 imageset / appiconset"""
+    contents_path = os.path.join(set_dir, "Contents.json")
+    if not os.path.exists(contents_path):
+        return [('error', contents_path, "缺少 Contents.json")]
+    try:
+        with open(contents_path, 'r', encoding='utf-8') as f:
+            contents = json.load(f)
+    except (OSError, ValueError) as e:
+        return [('error', contents_path, f"无法读取 Contents.json: {str(e)}")]
+
+    issues = []
+    base_sizes = {}
+    for entry in contents.get('images', []):
+        filename = entry.get('filename')
+        if not filename:
+            continue
+        path = os.path.join(set_dir, filename)
+        if not os.path.exists(path):
+            issues.append(('error', path, "Contents.json 引用的文件不存在"))
+            continue
+
+        info = probe(path)
+        format_issues = check_file_format(path, info)
+        if format_issues or info['format'] not in IMAGE_FORMATS:
+            issues.extend(format_issues)
+            continue
+
+        scale = float(entry.get('scale', '1x').rstrip('x'))
+        if 'size' in entry:
+            # 图标：像素尺寸必须等于 size × scale
+            points = [float(v) for v in entry['size'].split('x')]
+            expected = (round(points[0] * scale), round(points[1] * scale))
+            if (info['width'], info['height']) != expected:
+                issues.append(('error', path, f"尺寸应为 {expected[0]}x{expected[1]}，"
+                                              f"实际为 {info['width']}x{info['height']}"))
+        else:
+            base_sizes[filename] = (info['width'] / scale, info['height'] / scale, scale)
+
+    # 不同倍率的文件换算到 1x 后尺寸应一致
+    if len(base_sizes) > 1:
+        widths = [w for w, _, _ in base_sizes.values()]
+        heights = [h for _, h, _ in base_sizes.values()]
+        if max(widths) - min(widths) > 1 or max(heights) - min(heights) > 1:
+            detail = ', '.join(f"{name}@{s:g}x={w * s:.0f}x{h * s:.0f}" for name, (w, h, s) in base_sizes.items())
+            issues.append(('warning', set_dir, f"各倍率尺寸不成比例: {detail}"))
+    return issues
+
+def collect_checks(sounds_dir=SOUNDS_DIR, assets_dir=ASSETS_DIR):
+    """生成所有检查任务（无参可调用对象）"""
+    checks = []
+
+    if os.path.isdir(sounds_dir):
+        files = sorted(os.listdir(sounds_dir))
+        specced = set()
+        for name in files:
+            if name.endswith('.spec'):
+                target = os.path.join(sounds_dir, name[:-len('.spec')])
+                specced.add(os.path.basename(target))
+                checks.append(lambda t=target, s=os.path.join(sounds_dir, name): check_audio(t, s))
+        for name in files:
+            if EXTENSION_FORMATS.get(os.path.splitext(name)[1].lower()) in AUDIO_FORMATS and name not in specced:
+                checks.append(lambda p=os.path.join(sounds_dir, name): check_audio(p))
+
+    if os.path.isdir(assets_dir):
+        for name in sorted(os.listdir(assets_dir)):
+            if name.endswith(('.imageset', '.appiconset')):
+                checks.append(lambda d=os.path.join(assets_dir, name): check_image_set(d))
+
+    return checks
+
+def run_checks(checks, workers=None):
+    """线程池并行执行检查任务，返回所有问题"""
+    with ThreadPoolExecutor(max_workers=workers or min(32, (os.cpu_count() or 1) * 4)) as executor:
+        results = executor.map(lambda check: check(), checks)
+        return [issue for issues in results for issue in issues]
+
+def main():
+    """主函数"""
+    parser = argparse.ArgumentParser(description="Mathaxy 资源校验工具")
+    parser.add_argument('--strict', action='store_true', help="警告也视为失败")
+    args = parser.parse_args()
+
+    print("🔍 Mathaxy 资源校验工具")
+    print("=====================")
+    print()
+
+    checks = collect_checks()
+    print(f"📝 检查项: {len(checks)} 个")
+    print()
+
+    issues = run_checks(checks)
+    errors = [i for i in issues if i[0] == 'error']
+    warnings = [i for i in issues if i[0] == 'warning']
+
+    for level, path, message in sorted(issues, key=lambda i: (i[0], i[1])):
+        icon = "❌" if level == 'error' else "⚠️ "
+        print(f"{icon} {os.path.relpath(path, RESOURCES_DIR)}: {message}")
+
+    print()
+    print("=====================")
+    print(f"❌ 错误: {len(errors)} 个")
+    print(f"⚠️  警告: {len(warnings)} 个")
+
+    if errors or (args.strict and warnings):
+        return 1
+    print("🎉 所有资源校验通过！")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())